@@ -1,15 +1,22 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Iterator, List, Tuple, Type
 
-from fastapi import FastAPI
-from fastapi.responses import PlainTextResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import PlainTextResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from pathlib import Path
 import json
 
+from otm_model import codec as otm_codec
+from otm_model.schemas import schema_registry
+from otm_model.trusted import dump_otm, load_otm
+
 from .executors import exec_dataflow_editor, exec_trustzone_manager
 from .components import registry
 
@@ -19,7 +26,15 @@ class OtmOpRequest(BaseModel):
     op: Dict[str, Any]
 
 
-app = FastAPI(title="Threatflow Langflow Server")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Verify and compile the vendor schemas once, before the first request;
+    # a missing schema index only makes the schemas unavailable.
+    schema_registry()
+    yield
+
+
+app = FastAPI(title="Threatflow Langflow Server", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -28,6 +43,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(ValueError)
+async def _bad_op(request: Request, exc: ValueError) -> JSONResponse:
+    # executors raise ValueError for invalid op parameters
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
 # Serve UI extensions static files (manifest and bundle)
 try:
     dist_dir = Path(__file__).resolve().parents[4] / "apps" / "langflow-ui-extensions" / "dist"
@@ -38,14 +60,80 @@ except Exception:
     pass
 
 
-@app.post("/otm/dataflow")
-def api_dataflow(req: OtmOpRequest) -> Dict[str, Any]:
-    return exec_dataflow_editor(req.otm, req.op)
-
-
-@app.post("/otm/trustzone")
-def api_trustzone(req: OtmOpRequest) -> Dict[str, Any]:
-    return exec_trustzone_manager(req.otm, req.op)
+# ----- binary OTM content negotiation -----
+#
+# OTM endpoints accept either the usual JSON body {"otm": ..., "op": ...}, or
+# the binary OTM encoding (Content-Type: otm_codec.MEDIA_TYPE) as the body
+# with the op as JSON in the `op` query parameter. Clients sending
+# `Accept: otm_codec.MEDIA_TYPE` get OTM results back in the binary encoding,
+# with its content hash as ETag.
+
+
+async def _read_otm_request(request: Request, model: Type[BaseModel]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type == otm_codec.MEDIA_TYPE:
+        try:
+            otm = otm_codec.decode_otm(await request.body())
+            op = json.loads(request.query_params.get("op") or "{}")
+        except (otm_codec.CodecError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from None
+        # registered as trusted, so executors that only read it skip revalidation;
+        # unset optionals are left out, as a JSON client would send the document
+        return dump_otm(otm, exclude_none=True), op
+    try:
+        req = model.model_validate(await request.json())
+    except ValueError as exc:
+        if isinstance(exc, ValidationError):
+            errors = [{**e, "loc": ("body", *e["loc"])} for e in exc.errors()]
+        else:
+            errors = [{"loc": ("body",), "msg": str(exc), "type": "json_invalid"}]
+        raise RequestValidationError(errors) from None
+    return req.otm, req.op  # type: ignore[attr-defined]
+
+
+def _otm_body(model: Type[BaseModel]) -> Dict[str, Any]:
+    """OpenAPI requestBody for endpoints that read the body through _read_otm_request."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": model.model_json_schema()},
+                otm_codec.MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+            },
+        },
+        "parameters": [
+            {
+                "name": "op",
+                "in": "query",
+                "required": False,
+                "description": f"JSON op, for {otm_codec.MEDIA_TYPE} bodies",
+                "schema": {"type": "string"},
+            }
+        ],
+    }
+
+
+def _wants_binary(request: Request) -> bool:
+    return otm_codec.MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _otm_response(request: Request, result: Dict[str, Any]) -> Any:
+    if not _wants_binary(request):
+        return result
+    data, digest = otm_codec.encode_otm(load_otm(result))
+    return Response(data, media_type=otm_codec.MEDIA_TYPE, headers={"ETag": f'"{digest}"'})
+
+
+@app.post("/otm/dataflow", openapi_extra=_otm_body(OtmOpRequest))
+async def api_dataflow(request: Request) -> Any:
+    otm, op = await _read_otm_request(request, OtmOpRequest)
+    return _otm_response(request, await run_in_threadpool(exec_dataflow_editor, otm, op))
+
+
+@app.post("/otm/trustzone", openapi_extra=_otm_body(OtmOpRequest))
+async def api_trustzone(request: Request) -> Any:
+    otm, op = await _read_otm_request(request, OtmOpRequest)
+    return _otm_response(request, await run_in_threadpool(exec_trustzone_manager, otm, op))
 
 
 @app.get("/components")
@@ -53,16 +141,26 @@ def api_list_components() -> Dict[str, Any]:
     return {"components": registry.list_components()}
 
 
+# op["stream"] -> media type of executors that return an iterator of text chunks
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sarif": "application/sarif+json"}
+
+
 class ExecRequest(BaseModel):
     otm: Dict[str, Any]
     op: Dict[str, Any]
 
 
-@app.post("/components/{comp_id}/execute")
-def api_execute_component(comp_id: str, req: ExecRequest):
-    result = registry.execute(comp_id, req.otm, req.op)
+@app.post("/components/{comp_id}/execute", openapi_extra=_otm_body(ExecRequest))
+async def api_execute_component(comp_id: str, request: Request):
+    otm, op = await _read_otm_request(request, ExecRequest)
+    result = await run_in_threadpool(registry.execute, comp_id, otm, op)
     if isinstance(result, str):
         return PlainTextResponse(result)
+    if isinstance(result, Iterator):
+        media_type = STREAM_MEDIA_TYPES.get(str(op.get("stream")), "text/plain")
+        return StreamingResponse(result, media_type=media_type)
+    if isinstance(result, dict) and "otmVersion" in result:
+        return _otm_response(request, result)
     return result
 
 
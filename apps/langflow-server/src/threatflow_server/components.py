@@ -8,6 +8,7 @@ from .executors import (
     exec_layout_writer,
     exec_otm_validate,
     exec_rule_engine_evaluate,
+    exec_rule_engine_diff,
     exec_td_import,
     exec_td_export,
     exec_tg_import,
@@ -64,6 +65,11 @@ registry.register(
     {"name": "Rule Engine Evaluate", "category": "Analysis", "inputs": ["otm"], "outputs": ["json"]},
     exec_rule_engine_evaluate,
 )
+registry.register(
+    "RuleEngineDiff",
+    {"name": "Rule Engine Diff", "category": "Analysis", "inputs": ["otm"], "outputs": ["json"]},
+    exec_rule_engine_diff,
+)
 registry.register(
     "ThreatDragonImport",
     {"name": "Threat Dragon Import", "category": "Interop", "inputs": ["json"], "outputs": ["otm"]},
@@ -1,29 +1,35 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from otm_model.types import OTM, Component, Dataflow, TrustZone
+from otm_model import schemas as otm_schemas
 from otm_model import validate as otm_validate
+from otm_model.trusted import dump_otm, load_otm
 from adapters import td_to_otm, otm_to_td, threagile_to_otm, otm_to_threagile
 from rule_engine import evaluate as re_evaluate
+from rule_engine.diff import evaluate_diff
 from rule_engine.loader import load_rules_from_yaml_dir
+from rule_engine.model import Rule
+from rule_engine.writers import iter_ndjson, iter_sarif
 import yaml
 from pathlib import Path
 
 
 def exec_dataflow_editor(otm_dict: Dict[str, Any], op: Dict[str, Any]) -> Dict[str, Any]:
-    otm = OTM.model_validate(otm_dict)
+    otm = load_otm(otm_dict, mutable=True)
     action = op.get("action")
     if action == "add":
         df = Dataflow(**op["dataflow"])  # id, source, destination, protocol?
         otm.dataflows.append(df)
     elif action == "remove":
         otm.dataflows = [d for d in otm.dataflows if d.id != op.get("id")]
-    return otm.model_dump()
+    return dump_otm(otm)
 
 
 def exec_trustzone_manager(otm_dict: Dict[str, Any], op: Dict[str, Any]) -> Dict[str, Any]:
-    otm = OTM.model_validate(otm_dict)
+    otm = load_otm(otm_dict, mutable=True)
     action = op.get("action")
     if action == "add":
         tz = TrustZone(**op["trustZone"])  # id, name
@@ -31,11 +37,12 @@ def exec_trustzone_manager(otm_dict: Dict[str, Any], op: Dict[str, Any]) -> Dict
     elif action == "assign":
         target = op.get("componentId")
         tz_id = op.get("trustZoneId")
-        for c in otm.components:
+        for i, c in enumerate(otm.components):
             if c.id == target:
-                c.trustZone = tz_id
+                # re-validated, since dump_otm trusts the output as is
+                otm.components[i] = Component.model_validate({**c.model_dump(), "trustZone": tz_id})
                 break
-    return otm.model_dump()
+    return dump_otm(otm)
 
 
 def _ensure_extensions(otm: OTM) -> Dict[str, Any]:
@@ -51,7 +58,7 @@ def _ensure_extensions(otm: OTM) -> Dict[str, Any]:
 
 
 def exec_layout_writer(otm_dict: Dict[str, Any], op: Dict[str, Any]) -> Dict[str, Any]:
-    otm = OTM.model_validate(otm_dict)
+    otm = load_otm(otm_dict, mutable=True)
     xns = _ensure_extensions(otm)
     action = op.get("action", "set")
     layout = op.get("layout") or {}
@@ -67,25 +74,95 @@ def exec_layout_writer(otm_dict: Dict[str, Any], op: Dict[str, Any]) -> Dict[str
     else:
         # no-op for unknown actions
         pass
-    return otm.model_dump()
+    return dump_otm(otm)
 
 
 def exec_otm_validate(otm_dict: Dict[str, Any], op: Dict[str, Any] | None = None) -> Dict[str, Any]:
-    schema_rel = op.get("schema") if op else None
-    if schema_rel:
-        schema_path = Path(schema_rel)
-    else:
-        schema_path = Path(__file__).resolve().parents[4] / "schemas" / "vendor" / "otm" / "1.0.0" / "otm.schema.json"
-    otm_validate.validate_otm_document(otm_dict, schema_path)
+    op = op or {}
+    if op.get("schema"):
+        otm_validate.validate_otm_document(otm_dict, Path(op["schema"]))
+        return {"ok": True}
+    # Vendor schemas (otm, threat-dragon, threagile) come precompiled from the registry.
+    kind = op.get("kind") or "otm"
+    try:
+        errors = otm_schemas.validate(kind, otm_dict, collect=bool(op.get("collect")))
+    except otm_schemas.SchemaError as exc:
+        return {"ok": False, "kind": kind, "error": str(exc)}
+    if op.get("collect"):
+        return {"ok": not errors, "kind": kind, "errors": errors}
     return {"ok": True}
 
 
-def exec_rule_engine_evaluate(otm_dict: Dict[str, Any], op: Dict[str, Any] | None = None) -> Dict[str, Any]:
-    rules_dir = Path(op.get("rules_dir")) if op and op.get("rules_dir") else Path(__file__).resolve().parents[4] / "packages" / "rule-engine" / "rules" / "builtin"
+def _load_rules(op: Dict[str, Any]) -> List[Rule]:
+    rules_dir = Path(op.get("rules_dir")) if op.get("rules_dir") else Path(__file__).resolve().parents[4] / "packages" / "rule-engine" / "rules" / "builtin"
     rules = load_rules_from_yaml_dir(rules_dir)
-    otm = OTM.model_validate(otm_dict)
-    result = re_evaluate(otm, rules)
-    return result.model_dump()
+    if op.get("rule_ids"):
+        # e.g. the pendingRules of an earlier partial result
+        wanted = set(op["rule_ids"])
+        rules = [r for r in rules if r.id in wanted]
+    return rules
+
+
+def _workers(op: Dict[str, Any]) -> int:
+    """op["workers"], clamped to the CPUs of this host; 0 means in-process."""
+    workers = op.get("workers") or 0
+    if isinstance(workers, bool) or not isinstance(workers, int) or workers < 0:
+        raise ValueError("op.workers must be a non-negative integer")
+    return min(workers, os.cpu_count() or 1)
+
+
+def _budget(op: Dict[str, Any]) -> Tuple[Optional[float], Optional[int]]:
+    """op["deadline_ms"] and op["max_findings"]; None means unlimited."""
+    deadline_ms, max_findings = op.get("deadline_ms"), op.get("max_findings")
+    if deadline_ms is not None and (
+        isinstance(deadline_ms, bool) or not isinstance(deadline_ms, (int, float)) or not deadline_ms >= 0
+    ):
+        raise ValueError("op.deadline_ms must be a non-negative number")
+    if max_findings is not None and (
+        isinstance(max_findings, bool) or not isinstance(max_findings, int) or max_findings < 0
+    ):
+        raise ValueError("op.max_findings must be a non-negative integer")
+    return deadline_ms, max_findings
+
+
+def exec_rule_engine_evaluate(otm_dict: Dict[str, Any], op: Dict[str, Any] | None = None) -> Dict[str, Any] | Iterator[str]:
+    op = op or {}
+    rules = _load_rules(op)
+    otm = load_otm(otm_dict)
+    workers = _workers(op)
+    deadline_ms, max_findings = _budget(op)
+    profile = bool(op.get("profile"))
+    stream = op.get("stream")
+    # Findings stay compact: messages are rendered only as each one is serialized.
+    compact = re_evaluate(
+        otm,
+        rules,
+        workers=workers or None,
+        compact=True,
+        profile=profile,
+        deadline_ms=deadline_ms,
+        max_findings=max_findings,
+    )
+    if stream == "sarif":
+        return iter_sarif(compact.findings, rules, pending_rules=compact.pending_rules)
+    if stream == "ndjson":
+        # Serialized finding by finding; the summary comes at the end of the stream.
+        return iter_ndjson(compact.findings, pending_rules=compact.pending_rules)
+    out = compact.to_dict()
+    if not profile:
+        out.pop("profile", None)
+    return out
+
+
+def exec_rule_engine_diff(otm_dict: Dict[str, Any], op: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """Findings of `otm` (head) against op["base"]: new, fixed and unchanged."""
+    op = op or {}
+    if not op.get("base"):
+        raise ValueError("op.base (the base OTM) is required")
+    base = load_otm(op["base"])
+    head = load_otm(otm_dict)
+    diff = evaluate_diff(base, head, _load_rules(op))
+    return {**diff.model_dump(), "summary": diff.counts()}
 
 
 def exec_td_import(op: Dict[str, Any]) -> Dict[str, Any]:
@@ -95,11 +172,11 @@ def exec_td_import(op: Dict[str, Any]) -> Dict[str, Any]:
         import json
         td = json.loads(td)
     otm = td_to_otm(td)
-    return otm.model_dump()
+    return dump_otm(otm)
 
 
 def exec_td_export(otm_dict: Dict[str, Any]) -> Dict[str, Any]:
-    otm = OTM.model_validate(otm_dict)
+    otm = load_otm(otm_dict)
     return otm_to_td(otm)
 
 
@@ -108,11 +185,11 @@ def exec_tg_import(op: Dict[str, Any]) -> Dict[str, Any]:
     if isinstance(tg, str):
         tg = yaml.safe_load(tg)
     otm = threagile_to_otm(tg)
-    return otm.model_dump()
+    return dump_otm(otm)
 
 
 def exec_tg_export(otm_dict: Dict[str, Any]) -> str:
-    otm = OTM.model_validate(otm_dict)
+    otm = load_otm(otm_dict)
     tg = otm_to_threagile(otm)
     return yaml.safe_dump(tg, sort_keys=False, allow_unicode=True)
 
@@ -123,5 +200,5 @@ def exec_tg_analyze(op: Dict[str, Any]) -> Dict[str, Any]:
     if isinstance(tg, str):
         tg = yaml.safe_load(tg)
     otm = threagile_to_otm(tg)
-    return exec_rule_engine_evaluate(otm.model_dump(), {"rules_dir": str(Path(__file__).resolve().parents[4] / "packages" / "rule-engine" / "rules" / "builtin")})
+    return exec_rule_engine_evaluate(dump_otm(otm), {"rules_dir": str(Path(__file__).resolve().parents[4] / "packages" / "rule-engine" / "rules" / "builtin")})
 
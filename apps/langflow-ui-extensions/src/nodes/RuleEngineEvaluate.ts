@@ -2,6 +2,13 @@ export type OTMDocument = any;
 
 export type RuleEngineOp = {
   rules_dir?: string;
+  workers?: number;
+  profile?: boolean;
+  deadline_ms?: number;
+  max_findings?: number;
+  rule_ids?: string[];
+  // Stream findings as NDJSON lines or a SARIF log instead of one JSON result
+  stream?: "ndjson" | "sarif";
 };
 
 export async function ruleEngineEvaluate(
@@ -15,6 +22,7 @@ export async function ruleEngineEvaluate(
     body: JSON.stringify({ otm, op }),
   });
   if (!res.ok) throw new Error(`ruleEngineEvaluate failed: ${res.status} ${await res.text()}`);
+  if (op.stream) return await res.text();
   return await res.json();
 }
 
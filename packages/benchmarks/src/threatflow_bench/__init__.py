@@ -0,0 +1,8 @@
+from .generator import generate_otm
+from .suites import BENCHMARKS, run_benchmarks
+
+__all__ = [
+    "generate_otm",
+    "BENCHMARKS",
+    "run_benchmarks",
+]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .suites import run_benchmarks
+
+DEFAULT_BASELINE = Path(__file__).resolve().parents[2] / "baseline.json"
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    """Names of benchmarks slower than baseline by more than `tolerance` (a ratio)."""
+    return [
+        name
+        for name, seconds in results.items()
+        if name in baseline and seconds > baseline[name] * (1.0 + tolerance)
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="threatflow-bench", description="Run Threatflow benchmarks")
+    parser.add_argument("-k", dest="names", action="append", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--size", type=int, default=1000, help="Number of components in generated models")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--save", action="store_true", help="Write results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(size=args.size, repeat=args.repeat, names=args.names)
+
+    baseline: Dict[str, float] = {}
+    if args.baseline.exists():
+        stored = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if stored.get("size") == args.size:
+            baseline = stored.get("results", {})
+
+    for name, seconds in results.items():
+        ref = baseline.get(name)
+        delta = f"{(seconds / ref - 1.0) * 100:+.1f}%" if ref else "n/a"
+        print(f"{name:40s} {seconds * 1000:10.2f} ms  {delta}")
+
+    if args.save:
+        payload = {"size": args.size, "repeat": args.repeat, "results": {**baseline, **results}}
+        args.baseline.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for name in regressions:
+        print(f"REGRESSION: {name}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import random
+from typing import List, Sequence
+
+from otm_model.types import OTM, Component, Dataflow, Mitigation, Threat, TrustZone
+
+COMPONENT_TYPES = ("process", "store", "actor", "service", "database", "ecu")
+PROTOCOLS = ("https", "http", "tcp", "tls", "mqtt", "can", "grpc")
+TAGS = ("internet", "pci", "pii", "safety", "legacy", "debug", "ota", "telematics")
+
+
+def generate_otm(
+    components: int = 1000,
+    trust_zones: int = 8,
+    dataflow_density: float = 1.5,
+    tag_vocabulary: Sequence[str] = TAGS,
+    tags_per_component: float = 1.0,
+    protocols: Sequence[str] = PROTOCOLS,
+    threats: int = 0,
+    mitigation_coverage: float = 0.5,
+    seed: int = 0,
+) -> OTM:
+    """Build a reproducible synthetic OTM.
+
+    `dataflow_density` is dataflows per component. Tags are drawn with a
+    Zipf-like skew so a few tags are common and most are rare, as in real
+    models. Threats apply to random components; `mitigation_coverage` of
+    them get one mitigation.
+    """
+    rng = random.Random(seed)
+    zones = [TrustZone(id=f"tz{i}", name=f"Zone {i}") for i in range(trust_zones)]
+    weights = [1.0 / (rank + 1) for rank in range(len(tag_vocabulary))]
+
+    comps: List[Component] = []
+    for i in range(components):
+        n_tags = min(len(tag_vocabulary), int(rng.expovariate(1.0 / tags_per_component))) if tags_per_component else 0
+        tags = sorted(set(rng.choices(tag_vocabulary, weights=weights, k=n_tags))) if n_tags else []
+        comps.append(
+            Component(
+                id=f"c{i}",
+                name=f"Component {i}",
+                type=rng.choice(COMPONENT_TYPES),
+                trustZone=zones[rng.randrange(trust_zones)].id if zones else None,
+                tags=tags,
+            )
+        )
+
+    flows: List[Dataflow] = []
+    if components > 1:
+        for i in range(int(components * dataflow_density)):
+            src = rng.randrange(components)
+            dst = rng.randrange(components - 1)
+            if dst >= src:
+                dst += 1
+            flows.append(Dataflow(id=f"f{i}", source=f"c{src}", destination=f"c{dst}", protocol=rng.choice(protocols)))
+
+    threat_list: List[Threat] = []
+    mitigation_list: List[Mitigation] = []
+    for i in range(threats):
+        targets = [f"c{rng.randrange(components)}" for _ in range(rng.randint(1, 3))] if components else []
+        threat_list.append(Threat(id=f"t{i}", name=f"Threat {i}", appliesTo=sorted(set(targets))))
+        if rng.random() < mitigation_coverage:
+            mitigation_list.append(Mitigation(id=f"m{i}", name=f"Mitigation {i}", appliesTo=[f"t{i}"]))
+
+    return OTM(
+        otmVersion="0.1",
+        name=f"synthetic-{components}-{seed}",
+        trustZones=zones,
+        components=comps,
+        dataflows=flows,
+        threats=threat_list,
+        mitigations=mitigation_list,
+    )
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from adapters import otm_to_td, otm_to_threagile, td_to_otm, threagile_to_otm
+from otm_model.codec import decode_columnar, encode_otm
+from otm_model.columnar import ColumnarOTM
+from otm_model.trusted import dump_otm, load_otm
+from otm_model.types import OTM
+from otm_model.validate import validate_otm_document
+from rule_engine import evaluate, load_rules_from_dicts, merge_findings
+from rule_engine.model import EvaluationResult
+
+from .generator import generate_otm
+
+# A benchmark takes a model size and returns the zero-argument callable to time.
+Benchmark = Callable[[int], Callable[[], Any]]
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+ROOT = Path(__file__).resolve().parents[4]
+OTM_SCHEMA = ROOT / "schemas" / "vendor" / "otm" / "1.0.0" / "otm.schema.json"
+
+RULE_PACK = [
+    {"id": "B-PLAIN", "title": "plaintext", "severity": "high", "select": "dataflows",
+     "where": "contains(`['http','tcp','mqtt','can']`, protocol)", "message": "{id}"},
+    {"id": "B-CROSS", "title": "cross zone", "severity": "critical", "select": "dataflows",
+     "where": "protocol != 'tls' && cross_trust_zone(@)", "message": "{id}"},
+    {"id": "B-TAG", "title": "internet facing", "severity": "medium", "select": "components",
+     "where": "contains(tags, 'internet')", "message": "{name}"},
+    {"id": "B-STORE", "title": "store", "severity": "low", "select": "components",
+     "where": "type == 'store' && length(tags) > `1`", "message": "{name}"},
+    {"id": "B-OTM", "title": "size", "severity": "info", "select": "otm",
+     "where": "length(dataflows) > length(components)", "message": "{name}"},
+]
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    def register(fn: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = fn
+        return fn
+
+    return register
+
+
+@benchmark("rule_engine.evaluate")
+def bench_evaluate(size: int) -> Callable[[], Any]:
+    otm = generate_otm(components=size)
+    rules = load_rules_from_dicts(RULE_PACK)
+    return lambda: evaluate(otm, rules)
+
+
+@benchmark("rule_engine.evaluate_compact")
+def bench_evaluate_compact(size: int) -> Callable[[], Any]:
+    otm = generate_otm(components=size)
+    rules = load_rules_from_dicts(RULE_PACK)
+    return lambda: evaluate(otm, rules, compact=True)
+
+
+@benchmark("rule_engine.merge_findings")
+def bench_merge_findings(size: int) -> Callable[[], Any]:
+    local = evaluate(generate_otm(components=size), load_rules_from_dicts(RULE_PACK))
+    external = [
+        {"ruleId": f"ext-{i % 7}", "title": f"external {i % 7}", "severity": "medium",
+         "entityType": "component", "entityId": f"c{i % size}", "message": "from analyzer"}
+        for i in range(size * 2)
+    ]
+    return lambda: merge_findings(EvaluationResult(findings=local.findings, summary=local.summary), external)
+
+
+@benchmark("adapters.threat_dragon_roundtrip")
+def bench_td_roundtrip(size: int) -> Callable[[], Any]:
+    otm = generate_otm(components=size)
+    return lambda: td_to_otm(otm_to_td(otm))
+
+
+@benchmark("adapters.threagile_roundtrip")
+def bench_threagile_roundtrip(size: int) -> Callable[[], Any]:
+    otm = generate_otm(components=size)
+    return lambda: threagile_to_otm(otm_to_threagile(otm))
+
+
+@benchmark("otm_model.validate_otm_document")
+def bench_validate(size: int) -> Callable[[], Any]:
+    doc = generate_otm(components=size).model_dump(exclude_none=True)
+    doc["otmVersion"] = "1.0.0"
+    return lambda: validate_otm_document(doc, OTM_SCHEMA)
+
+
+# Run with --size 50000 -k otm_model.load to compare the two paths on large models.
+@benchmark("otm_model.load_validated")
+def bench_load_validated(size: int) -> Callable[[], Any]:
+    doc = generate_otm(components=size).model_dump()
+    return lambda: OTM.model_validate(doc)
+
+
+@benchmark("otm_model.load_trusted")
+def bench_load_trusted(size: int) -> Callable[[], Any]:
+    # a document the process produced itself, sent back after a JSON round trip
+    doc = json.loads(json.dumps(dump_otm(generate_otm(components=size))))
+    return lambda: load_otm(doc)
+
+
+@benchmark("otm_model.load_columnar")
+def bench_load_columnar(size: int) -> Callable[[], Any]:
+    doc = generate_otm(components=size).model_dump()
+    return lambda: ColumnarOTM.from_dict(doc)
+
+
+@benchmark("otm_model.decode_binary")
+def bench_decode_binary(size: int) -> Callable[[], Any]:
+    data, _ = encode_otm(generate_otm(components=size))
+    return lambda: decode_columnar(data)
+
+
+def time_callable(fn: Callable[[], Any], repeat: int) -> float:
+    """Best-of-`repeat` wall time in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_benchmarks(size: int = 1000, repeat: int = 3, names: List[str] | None = None) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    for name, bench in BENCHMARKS.items():
+        if names and not any(n in name for n in names):
+            continue
+        results[name] = time_callable(bench(size), repeat)
+    return results
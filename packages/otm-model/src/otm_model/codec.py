@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from .columnar import NONE, ColumnarOTM, ComponentTable, DataflowTable, StringTable
+from .types import OTM
+
+MEDIA_TYPE = "application/vnd.otm+binary"
+
+MAGIC = b"OTMB"
+VERSION = 1
+# magic, version, 3 pad bytes, sha256 of the body
+_HEADER = struct.Struct("<4sB3x32s")
+_U32 = struct.Struct("<I")
+
+# value tags of the document tree (everything but components and dataflows)
+_NULL, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _DICT = range(8)
+_F64 = struct.Struct("<d")
+
+# column codes are stored as little-endian int32
+assert array("i").itemsize == 4
+_SWAP = sys.byteorder != "little"
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class CodecError(ValueError):
+    """Binary OTM data is truncated, corrupt or of an unsupported version."""
+
+
+def _put_varint(out: bytearray, n: int) -> None:
+    while n > 0x7F:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _encode_value(value: Any, out: bytearray, ref: Callable[[str], int]) -> None:
+    """MessagePack-style tagged encoding; strings are varint refs into the string table."""
+    if value is None:
+        out.append(_NULL)
+    elif value is True or value is False:
+        out.append(_TRUE if value else _FALSE)
+    elif isinstance(value, int):
+        out.append(_INT)
+        _put_varint(out, value << 1 if value >= 0 else (~value << 1) | 1)
+    elif isinstance(value, float):
+        out.append(_FLOAT)
+        out += _F64.pack(value)
+    elif isinstance(value, str):
+        out.append(_STR)
+        _put_varint(out, ref(value))
+    elif isinstance(value, (list, tuple)):
+        out.append(_LIST)
+        _put_varint(out, len(value))
+        for item in value:
+            _encode_value(item, out, ref)
+    elif isinstance(value, dict):
+        out.append(_DICT)
+        _put_varint(out, len(value))
+        # sorted keys keep the encoding, and so the hash, independent of key order
+        for key in sorted(value):
+            if not isinstance(key, str):
+                raise TypeError(f"binary OTM keys must be strings, got {key!r}")
+            _put_varint(out, ref(key))
+            _encode_value(value[key], out, ref)
+    else:
+        raise TypeError(f"cannot encode {type(value).__name__} in binary OTM")
+
+
+def _put_codes(out: bytearray, codes: array) -> None:
+    if _SWAP:
+        codes = array("i", codes)
+        codes.byteswap()
+    out += codes.tobytes()
+
+
+def _canonical_columns(col: ColumnarOTM) -> Tuple[Dict[int, int], List[array], List[array]]:
+    """Renumber the codes used by the rows in first-use order.
+
+    This is the order ColumnarOTM.from_otm interns in, so the table holds
+    exactly the strings the rows reference, however `col` was built
+    (slices share their parent's table).
+    """
+    remap: Dict[int, int] = {}
+    setdefault = remap.setdefault
+    comps, flows = col.components, col.dataflows
+    ids, names, types, zones, offsets, tags = (array("i") for _ in range(6))
+    offsets.append(0)
+    tag_codes, tag_offsets = comps.tag_codes, comps.tag_offsets
+    for cid, name, ctype, zone, begin, end in zip(
+        comps.ids, comps.names, comps.types, comps.trust_zones, tag_offsets, tag_offsets[1:]
+    ):
+        ids.append(setdefault(cid, len(remap)))
+        names.append(setdefault(name, len(remap)))
+        types.append(setdefault(ctype, len(remap)))
+        zones.append(NONE if zone == NONE else setdefault(zone, len(remap)))
+        if end > begin:
+            tags.extend([setdefault(c, len(remap)) for c in tag_codes[begin:end]])
+        offsets.append(len(tags))
+    flow_ids, sources, destinations, protocols = (array("i") for _ in range(4))
+    for did, src, dst, protocol in zip(flows.ids, flows.sources, flows.destinations, flows.protocols):
+        flow_ids.append(setdefault(did, len(remap)))
+        sources.append(setdefault(src, len(remap)))
+        destinations.append(setdefault(dst, len(remap)))
+        protocols.append(NONE if protocol == NONE else setdefault(protocol, len(remap)))
+    return remap, [ids, names, types, zones, offsets, tags], [flow_ids, sources, destinations, protocols]
+
+
+def encode_otm(otm: Union[OTM, ColumnarOTM]) -> Tuple[bytes, str]:
+    """Encode `otm`; returns (data, sha256 hex digest of its canonical content).
+
+    Components and dataflows are written as int32 code columns (see
+    otm_model.columnar) after one string table, the rest of the document as
+    a tagged value tree. The same content always encodes to the same bytes,
+    whatever the key order or formatting it was read from and whether it is
+    given as an OTM or a ColumnarOTM, so the digest (taken over the body and
+    stored in the header) doubles as a content hash.
+    """
+    col = otm if isinstance(otm, ColumnarOTM) else ColumnarOTM.from_otm(otm)
+    strings = col.strings
+    remap, comp_columns, flow_columns = _canonical_columns(col)
+    values = [strings.values[code] for code in remap]
+    # header strings not used by any row are appended in tree order
+    extra: Dict[str, int] = {}
+
+    def ref(value: str) -> int:
+        code = remap.get(strings.code(value), NONE)
+        if code == NONE:
+            code = extra.get(value, NONE)
+            if code == NONE:
+                code = extra[value] = len(values)
+                values.append(value)
+        return code
+
+    tree = bytearray()
+    _encode_value(col.header.model_dump(exclude={"components", "dataflows"}), tree, ref)
+
+    blob = "".join(values).encode("utf-8")
+    body = bytearray()
+    body += _U32.pack(len(values)) + _U32.pack(len(blob))
+    _put_codes(body, array("i", map(len, values)))
+    body += blob
+    body += bytes(-len(body) % 4)
+
+    body += _U32.pack(len(col.components)) + _U32.pack(len(comp_columns[-1]))
+    for column in comp_columns:
+        _put_codes(body, column)
+    body += _U32.pack(len(col.dataflows))
+    for column in flow_columns:
+        _put_codes(body, column)
+    body += _U32.pack(len(tree))
+    body += tree
+
+    digest = hashlib.sha256(body).digest()
+    return _HEADER.pack(MAGIC, VERSION, digest) + bytes(body), digest.hex()
+
+
+def content_hash(otm: Union[OTM, ColumnarOTM]) -> str:
+    return encode_otm(otm)[1]
+
+
+def read_digest(data: Buffer) -> str:
+    """The content hash stored in the header of encoded `data`."""
+    return _read_header(memoryview(data))[1]
+
+
+def _read_header(view: memoryview) -> Tuple[int, str]:
+    if len(view) < _HEADER.size:
+        raise CodecError("binary OTM is truncated")
+    magic, version, digest = _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise CodecError("not a binary OTM document")
+    if version != VERSION:
+        raise CodecError(f"unsupported binary OTM version {version}")
+    return _HEADER.size, digest.hex()
+
+
+class _Reader:
+    __slots__ = ("view", "pos", "strings")
+
+    def __init__(self, view: memoryview, pos: int) -> None:
+        self.view = view
+        self.pos = pos
+        self.strings: List[str] = []
+
+    def take(self, n: int) -> memoryview:
+        end = self.pos + n
+        if end > len(self.view):
+            raise CodecError("binary OTM is truncated")
+        chunk = self.view[self.pos : end]
+        self.pos = end
+        return chunk
+
+    def u32(self) -> int:
+        return _U32.unpack(self.take(4))[0]
+
+    def codes(self, n: int, limit: int, optional: bool = False) -> memoryview:
+        """n int32 codes, viewed in place (copied only on big-endian hosts)."""
+        chunk = self.take(4 * n)
+        if _SWAP:
+            swapped = array("i", chunk.tobytes())
+            swapped.byteswap()
+            column = memoryview(swapped)
+        else:
+            column = chunk.cast("i")
+        if n and (max(column) >= limit or min(column) < (NONE if optional else 0)):
+            raise CodecError("binary OTM column refers past its string table")
+        return column
+
+    def align(self) -> None:
+        self.pos += -self.pos % 4
+
+    def varint(self) -> int:
+        view, pos, shift, n = self.view, self.pos, 0, 0
+        while True:
+            if pos >= len(view):
+                raise CodecError("binary OTM is truncated")
+            byte = view[pos]
+            pos += 1
+            n |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                self.pos = pos
+                return n
+            shift += 7
+
+    def value(self) -> Any:
+        tag = self.take(1)[0]
+        if tag == _STR:
+            return self.string()
+        if tag == _DICT:
+            return {self.string(): self.value() for _ in range(self.varint())}
+        if tag == _LIST:
+            return [self.value() for _ in range(self.varint())]
+        if tag == _NULL:
+            return None
+        if tag == _INT:
+            n = self.varint()
+            return ~(n >> 1) if n & 1 else n >> 1
+        if tag == _FLOAT:
+            return _F64.unpack(self.take(8))[0]
+        if tag in (_FALSE, _TRUE):
+            return tag == _TRUE
+        raise CodecError(f"unknown binary OTM value tag {tag}")
+
+    def string(self) -> str:
+        try:
+            return self.strings[self.varint()]
+        except IndexError:
+            raise CodecError("binary OTM string ref past its string table") from None
+
+
+def decode_columnar(data: Buffer, verify: bool = True) -> ColumnarOTM:
+    """Decode into a ColumnarOTM whose code columns are views into `data`.
+
+    `data` must stay unmodified while the result is in use. With `verify`
+    the body is checked against the header digest first.
+    """
+    view = memoryview(data).cast("B")
+    start, digest = _read_header(view)
+    if verify and hashlib.sha256(view[start:]).hexdigest() != digest:
+        raise CodecError("binary OTM content does not match its digest")
+    r = _Reader(view, start)
+
+    count, blob_len = r.u32(), r.u32()
+    lengths = r.codes(count, 1 << 31)
+    try:
+        text = str(r.take(blob_len), "utf-8")
+    except UnicodeDecodeError as exc:
+        raise CodecError(f"binary OTM string table is not UTF-8: {exc}") from None
+    values: List[str] = []
+    at = 0
+    for n in lengths:
+        values.append(text[at : at + n])
+        at += n
+    r.align()
+    strings = StringTable.from_values(values)
+    r.strings = values
+
+    rows, tag_count = r.u32(), r.u32()
+    ids, names, types = (r.codes(rows, count) for _ in range(3))
+    zones = r.codes(rows, count, optional=True)
+    tag_offsets = r.codes(rows + 1, tag_count + 1)
+    tag_codes = r.codes(tag_count, count)
+    components = ComponentTable(strings, ids, names, types, zones, tag_offsets, tag_codes)
+    rows = r.u32()
+    flow_ids, sources, destinations = (r.codes(rows, count) for _ in range(3))
+    dataflows = DataflowTable(strings, flow_ids, sources, destinations, r.codes(rows, count, optional=True))
+
+    tree_len = r.u32()
+    end = r.pos + tree_len
+    header = r.value()
+    if r.pos != end or end != len(view):
+        raise CodecError("binary OTM has trailing or missing data")
+    return ColumnarOTM(OTM.model_validate(header), strings, components, dataflows)
+
+
+def decode_otm(data: Buffer, verify: bool = True) -> OTM:
+    return decode_columnar(data, verify).to_otm()
+
+
+def save_snapshot(path: Union[str, Path], otm: Union[OTM, ColumnarOTM]) -> str:
+    """Write the binary encoding of `otm` to `path`; returns its content hash."""
+    data, digest = encode_otm(otm)
+    Path(path).write_bytes(data)
+    return digest
+
+
+def load_snapshot(path: Union[str, Path], verify: bool = True) -> ColumnarOTM:
+    """Memory-map a stored snapshot; its columns are read from the mapping on access.
+
+    The mapping is released once the result and its tables are no longer referenced.
+    """
+    with open(path, "rb") as fh:
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    return decode_columnar(mapped, verify)
@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+from array import array
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from .types import OTM, Component, Dataflow
+
+# code stored for a missing optional string (trustZone, protocol)
+NONE = -1
+
+
+class StringTable:
+    """Interned strings; every string column of a ColumnarOTM stores codes into one table.
+
+    Sharing the table means a dataflow's source code equals its component's id
+    code, so joins can compare ints.
+    """
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    @classmethod
+    def from_values(cls, values: List[str]) -> "StringTable":
+        """Table over distinct `values`, whose codes are their positions."""
+        table = cls()
+        table.values = values
+        table._codes = {v: i for i, v in enumerate(values)}
+        return table
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return NONE
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def interner(self) -> Callable[[str], int]:
+        """A faster intern() for bulk loads (no None handling); call sync() when done."""
+        codes = self._codes
+        setdefault = codes.setdefault
+        return lambda value: setdefault(value, len(codes))
+
+    def sync(self) -> None:
+        """Append strings added through interner() to `values`; codes are insertion order."""
+        self.values.extend(islice(self._codes, len(self.values), None))
+
+    def code(self, value: str) -> int:
+        """Code of `value`, or NONE if no column holds it."""
+        return self._codes.get(value, NONE)
+
+    def get(self, code: int) -> Optional[str]:
+        return None if code == NONE else self.values[code]
+
+
+def _frozen(codes: array) -> memoryview:
+    # memoryview slices share the buffer, which is what makes table slicing zero-copy
+    return memoryview(codes)
+
+
+class _Table:
+    """Struct-of-arrays over a row range of shared, read-only code columns."""
+
+    __slots__ = ("strings",)
+    _row: type
+
+    def __len__(self) -> int:
+        return len(self.ids)  # type: ignore[attr-defined]
+
+    def __iter__(self) -> Iterator[Any]:
+        row = self._row
+        for i in range(len(self)):
+            yield row(self, i)
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, slice):
+            if key.step not in (None, 1):
+                raise ValueError("columnar tables only support contiguous slices")
+            return self._slice(*key.indices(len(self))[:2])
+        n = len(self)
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError(key)
+        return self._row(self, key)
+
+    def _slice(self, start: int, stop: int) -> Any:
+        raise NotImplementedError
+
+    def id_list(self) -> List[str]:
+        values = self.strings.values
+        return [values[c] for c in self.ids]  # type: ignore[attr-defined]
+
+
+class ComponentRow:
+    """Lightweight view of one component row; strings are looked up on access."""
+
+    __slots__ = ("_table", "_i")
+
+    def __init__(self, table: "ComponentTable", i: int) -> None:
+        self._table = table
+        self._i = i
+
+    @property
+    def id(self) -> str:
+        return self._table.strings.values[self._table.ids[self._i]]
+
+    @property
+    def name(self) -> str:
+        return self._table.strings.values[self._table.names[self._i]]
+
+    @property
+    def type(self) -> str:
+        return self._table.strings.values[self._table.types[self._i]]
+
+    @property
+    def trustZone(self) -> Optional[str]:
+        return self._table.strings.get(self._table.trust_zones[self._i])
+
+    @property
+    def tags(self) -> List[str]:
+        t = self._table
+        values = t.strings.values
+        return [values[c] for c in t.tag_codes[t.tag_offsets[self._i] : t.tag_offsets[self._i + 1]]]
+
+    def to_model(self) -> Component:
+        return Component(id=self.id, name=self.name, type=self.type, trustZone=self.trustZone, tags=self.tags)
+
+    def __repr__(self) -> str:
+        return f"ComponentRow(id={self.id!r})"
+
+
+class ComponentTable(_Table):
+    """Components as id / name / type / trustZone code columns plus CSR-packed tags.
+
+    tag_offsets holds positions into tag_codes for this table's rows (one
+    more entry than rows); slices share tag_codes and keep absolute offsets.
+    """
+
+    __slots__ = ("ids", "names", "types", "trust_zones", "tag_offsets", "tag_codes")
+    _row = ComponentRow
+
+    def __init__(
+        self,
+        strings: StringTable,
+        ids: memoryview,
+        names: memoryview,
+        types: memoryview,
+        trust_zones: memoryview,
+        tag_offsets: memoryview,
+        tag_codes: memoryview,
+    ) -> None:
+        self.strings = strings
+        self.ids = ids
+        self.names = names
+        self.types = types
+        self.trust_zones = trust_zones
+        self.tag_offsets = tag_offsets
+        self.tag_codes = tag_codes
+
+    @classmethod
+    def build(cls, strings: StringTable, rows: Sequence[Any]) -> "ComponentTable":
+        """Intern `rows`, which are Component models or component dicts."""
+        ids, names, types, zones = array("l"), array("l"), array("l"), array("l")
+        offsets, tags = array("l", [0]), array("l")
+        intern = strings.interner()
+        for pos, row in enumerate(rows):
+            if isinstance(row, dict):
+                try:
+                    cid, name, ctype = row["id"], row["name"], row["type"]
+                except KeyError as exc:
+                    raise ValueError(f"components[{pos}]: missing {exc.args[0]!r}") from None
+                zone, row_tags = row.get("trustZone"), row.get("tags") or ()
+            else:
+                cid, name, ctype, zone, row_tags = row.id, row.name, row.type, row.trustZone, row.tags
+            ids.append(intern(cid))
+            names.append(intern(name))
+            types.append(intern(ctype))
+            zones.append(NONE if zone is None else intern(zone))
+            if row_tags:
+                tags.extend(map(intern, row_tags))
+            offsets.append(len(tags))
+        strings.sync()
+        return cls(strings, *map(_frozen, (ids, names, types, zones, offsets, tags)))
+
+    def _slice(self, start: int, stop: int) -> "ComponentTable":
+        return ComponentTable(
+            self.strings,
+            self.ids[start:stop],
+            self.names[start:stop],
+            self.types[start:stop],
+            self.trust_zones[start:stop],
+            self.tag_offsets[start : max(start, stop) + 1],
+            self.tag_codes,
+        )
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Rows as component dicts, decoded column-wise."""
+        values, get = self.strings.values, self.strings.get
+        offsets, tag_codes = self.tag_offsets, self.tag_codes
+        return [
+            {
+                "id": values[cid],
+                "name": values[name],
+                "type": values[ctype],
+                "trustZone": get(zone),
+                "tags": [values[c] for c in tag_codes[start:stop]],
+            }
+            for cid, name, ctype, zone, start, stop in zip(
+                self.ids, self.names, self.types, self.trust_zones, offsets, offsets[1:]
+            )
+        ]
+
+    def to_models(self) -> List[Component]:
+        return [Component.model_validate(d) for d in self.to_dicts()]
+
+
+class DataflowRow:
+    """Lightweight view of one dataflow row."""
+
+    __slots__ = ("_table", "_i")
+
+    def __init__(self, table: "DataflowTable", i: int) -> None:
+        self._table = table
+        self._i = i
+
+    @property
+    def id(self) -> str:
+        return self._table.strings.values[self._table.ids[self._i]]
+
+    @property
+    def source(self) -> str:
+        return self._table.strings.values[self._table.sources[self._i]]
+
+    @property
+    def destination(self) -> str:
+        return self._table.strings.values[self._table.destinations[self._i]]
+
+    @property
+    def protocol(self) -> Optional[str]:
+        return self._table.strings.get(self._table.protocols[self._i])
+
+    def to_model(self) -> Dataflow:
+        return Dataflow(id=self.id, source=self.source, destination=self.destination, protocol=self.protocol)
+
+    def __repr__(self) -> str:
+        return f"DataflowRow(id={self.id!r})"
+
+
+class DataflowTable(_Table):
+    """Dataflows as id / source / destination / protocol code columns."""
+
+    __slots__ = ("ids", "sources", "destinations", "protocols")
+    _row = DataflowRow
+
+    def __init__(
+        self,
+        strings: StringTable,
+        ids: memoryview,
+        sources: memoryview,
+        destinations: memoryview,
+        protocols: memoryview,
+    ) -> None:
+        self.strings = strings
+        self.ids = ids
+        self.sources = sources
+        self.destinations = destinations
+        self.protocols = protocols
+
+    @classmethod
+    def build(cls, strings: StringTable, rows: Sequence[Any]) -> "DataflowTable":
+        """Intern `rows`, which are Dataflow models or dataflow dicts."""
+        ids, sources, destinations, protocols = array("l"), array("l"), array("l"), array("l")
+        intern = strings.interner()
+        for pos, row in enumerate(rows):
+            if isinstance(row, dict):
+                try:
+                    did, src, dst = row["id"], row["source"], row["destination"]
+                except KeyError as exc:
+                    raise ValueError(f"dataflows[{pos}]: missing {exc.args[0]!r}") from None
+                protocol = row.get("protocol")
+            else:
+                did, src, dst, protocol = row.id, row.source, row.destination, row.protocol
+            ids.append(intern(did))
+            sources.append(intern(src))
+            destinations.append(intern(dst))
+            protocols.append(NONE if protocol is None else intern(protocol))
+        strings.sync()
+        return cls(strings, *map(_frozen, (ids, sources, destinations, protocols)))
+
+    def _slice(self, start: int, stop: int) -> "DataflowTable":
+        return DataflowTable(
+            self.strings,
+            self.ids[start:stop],
+            self.sources[start:stop],
+            self.destinations[start:stop],
+            self.protocols[start:stop],
+        )
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        values, get = self.strings.values, self.strings.get
+        return [
+            {"id": values[did], "source": values[src], "destination": values[dst], "protocol": get(protocol)}
+            for did, src, dst, protocol in zip(self.ids, self.sources, self.destinations, self.protocols)
+        ]
+
+    def to_models(self) -> List[Dataflow]:
+        return [Dataflow.model_validate(d) for d in self.to_dicts()]
+
+
+class ColumnarOTM:
+    """An OTM whose components and dataflows are held column-wise.
+
+    Everything else (projects, trust zones, threats, mitigations, risks,
+    extensions) stays in `header`, an OTM with empty components and
+    dataflows; those collections are small even for fleet-sized models.
+    The tables are read-only; convert with to_otm() to edit.
+    """
+
+    __slots__ = ("header", "strings", "components", "dataflows")
+
+    def __init__(self, header: OTM, strings: StringTable, components: ComponentTable, dataflows: DataflowTable) -> None:
+        self.header = header
+        self.strings = strings
+        self.components = components
+        self.dataflows = dataflows
+
+    @classmethod
+    def from_otm(cls, otm: OTM) -> "ColumnarOTM":
+        strings = StringTable()
+        # shallow copy first so the deep copy does not walk the bulk collections
+        header = otm.model_copy(update={"components": [], "dataflows": []}).model_copy(deep=True)
+        return cls(
+            header,
+            strings,
+            ComponentTable.build(strings, otm.components),
+            DataflowTable.build(strings, otm.dataflows),
+        )
+
+    @classmethod
+    def from_dict(cls, doc: Dict[str, Any]) -> "ColumnarOTM":
+        """Build from an OTM document without creating a model per component or dataflow.
+
+        The header is validated as usual; component and dataflow rows are only
+        checked for their required keys (ValueError otherwise).
+        """
+        strings = StringTable()
+        rest = {k: v for k, v in doc.items() if k not in ("components", "dataflows")}
+        return cls(
+            OTM.model_validate(rest),
+            strings,
+            ComponentTable.build(strings, doc.get("components") or ()),
+            DataflowTable.build(strings, doc.get("dataflows") or ()),
+        )
+
+    def to_otm(self) -> OTM:
+        doc = self.header.model_dump()
+        doc["components"] = self.components.to_dicts()
+        doc["dataflows"] = self.dataflows.to_dicts()
+        return OTM.model_validate(doc)
+
+    def component_positions(self) -> Dict[int, int]:
+        """Component id code -> row, for joining dataflow source / destination codes."""
+        return {code: i for i, code in enumerate(self.components.ids)}
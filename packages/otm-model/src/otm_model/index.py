@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .types import OTM, Component, Dataflow, TrustZone
+
+_COLLECTIONS = ("trustZones", "components", "dataflows", "threats", "mitigations")
+
+
+class OtmIndex:
+    """Lookup structures over one OTM, built in a single pass.
+
+    Get one through index_of(), which reuses it until the OTM changes.
+    """
+
+    __slots__ = ("components", "dataflows", "trust_zones", "entities", "component_zone", "__weakref__")
+
+    def __init__(self, otm: OTM) -> None:
+        self.components: Dict[str, Component] = {c.id: c for c in otm.components}
+        self.dataflows: Dict[str, Dataflow] = {d.id: d for d in otm.dataflows}
+        self.trust_zones: Dict[str, TrustZone] = {z.id: z for z in otm.trustZones}
+        # any id-bearing entity; components win over dataflows, zones, threats, mitigations
+        self.entities: Dict[str, BaseModel] = {}
+        for name in reversed(_COLLECTIONS):
+            self.entities.update((e.id, e) for e in getattr(otm, name))
+        self.component_zone: Dict[str, Optional[str]] = {c.id: c.trustZone for c in otm.components}
+
+    def entity(self, entity_id: str) -> Optional[BaseModel]:
+        return self.entities.get(entity_id)
+
+
+# id(otm) -> (weak reference, signature, index)
+_CACHE: Dict[int, Tuple[Any, Tuple[Any, ...], OtmIndex]] = {}
+
+
+def _signature(otm: OTM) -> Tuple[Any, ...]:
+    # Everything the index is built from: collection and entity identities,
+    # ids, and the zone / endpoint fields. Read from this OTM only, so edits
+    # to other models never invalidate its index.
+    def digest(rows: Any) -> int:
+        return hash(tuple(rows))
+
+    return (
+        tuple((id(getattr(otm, n)), len(getattr(otm, n))) for n in _COLLECTIONS),
+        digest((id(c), c.id, c.trustZone) for c in otm.components),
+        digest((id(d), d.id, d.source, d.destination) for d in otm.dataflows),
+        digest((id(e), e.id) for n in ("trustZones", "threats", "mitigations") for e in getattr(otm, n)),
+    )
+
+
+def index_of(otm: OTM) -> OtmIndex:
+    """The OtmIndex of `otm`, rebuilt only if the model changed since the last call."""
+    key = id(otm)
+    signature = _signature(otm)
+    cached = _CACHE.get(key)
+    if cached is not None and cached[0]() is otm and cached[1] == signature:
+        return cached[2]
+    index = OtmIndex(otm)
+    _CACHE[key] = (weakref.ref(otm, lambda _, key=key: _CACHE.pop(key, None)), signature, index)
+    return index
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from jsonschema import Draft202012Validator, validators
+from jsonschema.protocols import Validator
+
+# packages/otm-model/src/otm_model/schemas.py -> repository root
+REPO_ROOT = Path(__file__).resolve().parents[4]
+DEFAULT_INDEX = REPO_ROOT / "schemas" / "vendor" / "schema-index.json"
+
+
+class SchemaError(Exception):
+    """A vendor schema is unknown, missing, corrupt or fails its sha256 check."""
+
+
+class _Entry:
+    __slots__ = ("kind", "version", "path", "sha256", "validator", "error")
+
+    def __init__(self, kind: str, record: Dict[str, Any], root: Path) -> None:
+        self.kind = kind
+        self.version = record.get("version")
+        self.path = root / record["path"]
+        self.sha256 = record.get("sha256") or ""
+        self.validator: Optional[Validator] = None
+        self.error: Optional[str] = None
+
+
+class SchemaRegistry:
+    """Vendor JSON schemas listed in schema-index.json, verified and compiled once.
+
+    Every entry is loaded on construction. A schema whose file is missing,
+    whose digest does not match the index or which is not a valid schema is
+    kept as unavailable: validate() raises SchemaError for it, the others
+    keep working. A missing or unreadable index leaves the registry empty,
+    with every lookup raising SchemaError.
+    """
+
+    def __init__(self, index_path: Path = DEFAULT_INDEX, root: Optional[Path] = None) -> None:
+        self.index_path = Path(index_path)
+        # index paths are relative to the repository root
+        self.root = root if root is not None else self.index_path.resolve().parents[2]
+        self.index_error: Optional[str] = None
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+            self._entries = {kind: _Entry(kind, record, self.root) for kind, record in index.items()}
+        except (OSError, ValueError, AttributeError, KeyError, TypeError) as exc:
+            self.index_error = f"schema index {self.index_path} is unavailable: {exc}"
+            self._entries = {}
+        for entry in self._entries.values():
+            self._compile(entry)
+
+    @staticmethod
+    def _compile(entry: _Entry) -> None:
+        if not entry.path.exists():
+            entry.error = f"schema file not found: {entry.path}"
+            return
+        raw = entry.path.read_bytes()
+        if entry.sha256 and hashlib.sha256(raw).hexdigest() != entry.sha256:
+            entry.error = f"sha256 mismatch for {entry.path}"
+            return
+        try:
+            schema = json.loads(raw)
+            cls = validators.validator_for(schema, default=Draft202012Validator)
+            cls.check_schema(schema)
+        except Exception as exc:
+            entry.error = f"invalid schema {entry.path}: {exc}"
+            return
+        entry.validator = cls(schema)
+
+    def kinds(self) -> List[str]:
+        return list(self._entries)
+
+    def available(self) -> Dict[str, bool]:
+        return {kind: e.validator is not None for kind, e in self._entries.items()}
+
+    def validator(self, kind: str) -> Validator:
+        entry = self._entries.get(kind)
+        if entry is None and self.index_error is not None:
+            raise SchemaError(self.index_error)
+        if entry is None:
+            raise SchemaError(f"unknown schema kind {kind!r}; known: {', '.join(self._entries)}")
+        if entry.validator is None:
+            raise SchemaError(f"schema {kind!r} is unavailable: {entry.error}")
+        return entry.validator
+
+    def validate(self, kind: str, doc: Any, collect: bool = False) -> List[Dict[str, str]]:
+        """Validate `doc` against the `kind` schema.
+
+        By default the first error is raised as jsonschema.ValidationError.
+        With `collect` every error is returned instead, as
+        {"path": JSON pointer, "message": ...} sorted by path; [] means valid.
+        """
+        validator = self.validator(kind)
+        if not collect:
+            validator.validate(doc)
+            return []
+        errors = [
+            {"path": "/" + "/".join(str(p) for p in err.absolute_path), "message": err.message}
+            for err in validator.iter_errors(doc)
+        ]
+        return sorted(errors, key=lambda e: e["path"])
+
+
+@lru_cache(maxsize=None)
+def schema_registry(index_path: Path = DEFAULT_INDEX) -> SchemaRegistry:
+    """Process-wide registry, built on first use."""
+    return SchemaRegistry(index_path)
+
+
+def validate(kind: str, doc: Any, collect: bool = False) -> List[Dict[str, str]]:
+    return schema_registry().validate(kind, doc, collect)
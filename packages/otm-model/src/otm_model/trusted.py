@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .types import OTM
+
+# Validated models kept per process, keyed by document digest; models can be
+# large, so only the most recent few are kept.
+TRUSTED_CACHE_SIZE = 8
+
+_TRUSTED: "OrderedDict[str, OTM]" = OrderedDict()
+
+
+def document_digest(doc: Dict[str, Any]) -> Optional[str]:
+    """sha256 of the canonical JSON form of `doc`, or None if it holds non-JSON values.
+
+    Equal documents digest the same whatever their key order or object
+    identity, so a document that went through a JSON round trip (an HTTP
+    response posted back) is still recognised.
+    """
+    try:
+        canonical = json.dumps(doc, sort_keys=True, separators=(",", ":"), ensure_ascii=False, allow_nan=False)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _remember(digest: Optional[str], otm: OTM) -> None:
+    if digest is None:
+        return
+    _TRUSTED[digest] = otm
+    _TRUSTED.move_to_end(digest)
+    while len(_TRUSTED) > TRUSTED_CACHE_SIZE:
+        _TRUSTED.popitem(last=False)
+
+
+def is_trusted(doc: Dict[str, Any]) -> bool:
+    digest = document_digest(doc)
+    return digest is not None and digest in _TRUSTED
+
+
+def clear_trusted() -> None:
+    _TRUSTED.clear()
+
+
+def load_otm(doc: Dict[str, Any], *, mutable: bool = False) -> OTM:
+    """OTM.model_validate, skipped for documents validated or produced here before.
+
+    A hit returns the shared, already validated instance, which callers must
+    not modify; pass `mutable=True` to always get a fresh model.
+    """
+    if mutable:
+        return OTM.model_validate(doc)
+    digest = document_digest(doc)
+    if digest is not None:
+        cached = _TRUSTED.get(digest)
+        if cached is not None:
+            _TRUSTED.move_to_end(digest)
+            return cached
+    otm = OTM.model_validate(doc)
+    _remember(digest, otm)
+    return otm
+
+
+def dump_otm(otm: OTM, *, exclude_none: bool = False) -> Dict[str, Any]:
+    """model_dump, remembering `otm` so the output loads without validation when sent back.
+
+    Only for models whose contents were validated (fields assigned after
+    construction are not re-checked), and which are not modified afterwards.
+    """
+    doc = otm.model_dump(exclude_none=exclude_none)
+    _remember(document_digest(doc), otm)
+    return doc
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -11,7 +12,13 @@ def load_schema(path: Path) -> dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def validate_otm_document(otm: dict[str, Any], schema_path: Path) -> None:
-    schema = load_schema(schema_path)
-    Draft202012Validator(schema).validate(otm)
+@lru_cache(maxsize=32)
+def _compiled(path: str, mtime_ns: int) -> Draft202012Validator:
+    return Draft202012Validator(load_schema(Path(path)))
+
 
+def validate_otm_document(otm: dict[str, Any], schema_path: Path) -> None:
+    # Compiled validators are reused until the schema file changes; vendor
+    # schemas are better served by otm_model.schemas.validate().
+    path = Path(schema_path).resolve()
+    _compiled(str(path), path.stat().st_mtime_ns).validate(otm)
@@ -1,13 +1,19 @@
 from .model import Rule, Finding, EvaluationResult
-from .runner import evaluate, load_rules_from_dicts
+from .compact import CompactFinding, CompactResult
+from .runner import evaluate, evaluate_many, load_rules_from_dicts
 from .merge import merge_findings
+from .diff import diff_results
 
 __all__ = [
     "Rule",
     "Finding",
     "EvaluationResult",
+    "CompactFinding",
+    "CompactResult",
     "evaluate",
+    "evaluate_many",
     "load_rules_from_dicts",
     "merge_findings",
+    "diff_results",
 ]
 
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, TextIO, Tuple
+
+from otm_model.types import OTM
+
+from .loader import load_rules_from_yaml_dir
+from .runner import evaluate_many
+from .writers import FindingLike, ndjson_line
+
+
+def iter_model_files(paths: List[str]) -> Iterator[Path]:
+    for raw in paths:
+        p = Path(raw)
+        if p.is_dir():
+            yield from sorted(p.rglob("*.json"))
+        else:
+            yield p
+
+
+def iter_models(paths: List[str], on_error: Callable[[str, str], None]) -> Iterator[Tuple[str, OTM]]:
+    """Read and validate model files one at a time as the evaluator asks for them.
+
+    Files that are not valid JSON or not an OTM are reported to `on_error`
+    and skipped, so one bad file does not stop the scan.
+    """
+    for p in iter_model_files(paths):
+        try:
+            yield str(p), OTM.model_validate(json.loads(p.read_text(encoding="utf-8")))
+        except (OSError, ValueError) as exc:
+            on_error(str(p), f"{type(exc).__name__}: {exc}")
+
+
+def write_ndjson_findings(out: TextIO, model_id: str, findings: List[FindingLike]) -> int:
+    for f in findings:
+        out.write(ndjson_line(f, model=model_id))
+    return len(findings)
+
+
+def write_ndjson_error(out: TextIO, model_id: str, error: str) -> None:
+    out.write(json.dumps({"model": model_id, "error": error}, ensure_ascii=False))
+    out.write("\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="threatflow-rules", description="Evaluate OTM files and emit NDJSON findings")
+    parser.add_argument("paths", nargs="+", help="OTM JSON files or directories to scan")
+    parser.add_argument("--rules", required=True, help="Directory of YAML rules")
+    parser.add_argument("--workers", type=int, default=None, help="Evaluate models in a process pool")
+    parser.add_argument("--output", "-o", default="-", help="NDJSON output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    rules = load_rules_from_yaml_dir(args.rules)
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    failed: List[str] = []
+
+    def on_error(model_id: str, error: str) -> None:
+        failed.append(model_id)
+        write_ndjson_error(out, model_id, error)
+
+    try:
+        models = iter_models(args.paths, on_error)
+        for model_id, result in evaluate_many(models, rules, workers=args.workers, compact=True):
+            write_ndjson_findings(out, model_id, result.findings)
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if failed:
+        print(f"threatflow-rules: {len(failed)} model(s) could not be evaluated", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Sequence
+
+
+def positions_to_mask(positions: Sequence[int], size: int) -> int:
+    """Pack row positions into an int bitset (bit i set <=> row i selected)."""
+    buf = bytearray((size + 7) // 8)
+    for i in positions:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+def iter_mask(mask: int) -> Iterator[int]:
+    """Yield set bit positions of `mask` in ascending order."""
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    for byte_pos, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            yield (byte_pos << 3) + low.bit_length() - 1
+            byte ^= low
+
+
+def _key(value: Any) -> Hashable:
+    # typed, so True / 1 / 1.0 and False / 0 / 0.0 get distinct codes
+    if isinstance(value, list):
+        return (list, tuple(_key(v) for v in value))
+    return (type(value), value)
+
+
+class Column:
+    """A single entity field stored as interned codes into a table of distinct values."""
+
+    __slots__ = ("values", "codes", "size", "_postings")
+
+    def __init__(self, values: List[Any], codes: array, size: int) -> None:
+        # values[code] is the first value seen for that code, as stored on the entity
+        self.values = values
+        self.codes = codes
+        self.size = size
+        self._postings: Optional[List[int]] = None
+
+    @classmethod
+    def build(cls, raw: Sequence[Any]) -> Optional["Column"]:
+        """Intern `raw`; returns None when a value cannot be interned (e.g. dicts)."""
+        table: Dict[Hashable, int] = {}
+        values: List[Any] = []
+        codes = array("l")
+        try:
+            for v in raw:
+                k = _key(v)
+                code = table.get(k)
+                if code is None:
+                    code = table[k] = len(values)
+                    values.append(v)
+                codes.append(code)
+        except TypeError:
+            return None
+        return cls(values, codes, len(raw))
+
+    def postings(self) -> List[int]:
+        """Row bitset per code, built once per column."""
+        if self._postings is None:
+            rows: List[List[int]] = [[] for _ in self.values]
+            for i, code in enumerate(self.codes):
+                rows[code].append(i)
+            self._postings = [positions_to_mask(r, self.size) for r in rows]
+        return self._postings
+
+    def mask_where(self, test: Callable[[Any], bool]) -> int:
+        """Evaluate `test` once per distinct value and broadcast the result to rows."""
+        postings = self.postings()
+        mask = 0
+        for code, value in enumerate(self.values):
+            if test(value):
+                mask |= postings[code]
+        return mask
+
+
+class EntityColumns:
+    """Lazily built columnar view over a list of entity dicts (components or dataflows)."""
+
+    def __init__(self, entities: Sequence[dict[str, Any]]) -> None:
+        self.entities = entities
+        self.size = len(entities)
+        self.all = (1 << self.size) - 1
+        self._columns: Dict[str, Optional[Column]] = {}
+        self._members: Dict[str, Optional[Dict[Hashable, int]]] = {}
+
+    def column(self, field: str) -> Optional[Column]:
+        if field not in self._columns:
+            self._columns[field] = Column.build([e.get(field) for e in self.entities])
+        return self._columns[field]
+
+    def members(self, field: str) -> Optional[Dict[Hashable, int]]:
+        """Inverted index element -> row bitset for list-valued fields such as `tags`.
+
+        None unless every row holds a list of hashable items.
+        """
+        if field not in self._members:
+            index: Optional[Dict[Hashable, List[int]]] = {}
+            for i, e in enumerate(self.entities):
+                items = e.get(field)
+                # contains() raises on a missing list, which a bitset cannot represent
+                if not isinstance(items, list):
+                    index = None
+                    break
+                try:
+                    for item in set(items):
+                        index.setdefault(item, []).append(i)
+                except TypeError:
+                    index = None
+                    break
+            self._members[field] = (
+                None if index is None else {k: positions_to_mask(v, self.size) for k, v in index.items()}
+            )
+        return self._members[field]
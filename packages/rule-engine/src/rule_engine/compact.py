@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from .message import compile_message
+from .model import EvaluationResult, Finding, Rule, RuleProfile
+
+
+class CompactFinding(NamedTuple):
+    """Tuple-backed finding that references its rule and entity instead of copying them.
+
+    The entity dict is the one held by the evaluation's EntitySnapshot, so
+    evidence costs nothing until a finding is converted with to_finding().
+    """
+
+    rule: Rule
+    entityType: str
+    entity: Dict[str, Any]
+
+    @property
+    def ruleId(self) -> str:
+        return self.rule.id
+
+    @property
+    def title(self) -> str:
+        return self.rule.title
+
+    @property
+    def severity(self) -> str:
+        return self.rule.severity
+
+    @property
+    def entityId(self) -> str:
+        return str(self.entity.get("id", "otm"))
+
+    @property
+    def message(self) -> str:
+        return compile_message(self.rule.message).render(self.entity)
+
+    @property
+    def remediation(self) -> Optional[str]:
+        return self.rule.remediation
+
+    @property
+    def tags(self) -> List[str]:
+        return self.rule.tags
+
+    @property
+    def evidence(self) -> Dict[str, Any]:
+        return self.entity
+
+    def to_finding(self) -> Finding:
+        return Finding(
+            ruleId=self.ruleId,
+            title=self.title,
+            severity=self.severity,
+            entityType=self.entityType,
+            entityId=self.entityId,
+            message=self.message,
+            remediation=self.remediation,
+            tags=self.tags,
+            evidence=self.entity,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same shape as Finding.model_dump(), without building the model."""
+        return {
+            "ruleId": self.ruleId,
+            "title": self.title,
+            "severity": self.severity,
+            "entityType": self.entityType,
+            "entityId": self.entityId,
+            "message": self.message,
+            "remediation": self.remediation,
+            "tags": list(self.tags),
+            "evidence": self.entity,
+            "sources": [],
+        }
+
+
+class CompactResult:
+    """Evaluation output made of CompactFinding; convert at the API boundary.
+
+    Serialize with to_dict() when no pydantic model is needed: findings are
+    not validated and each message is rendered only as it is written.
+    """
+
+    __slots__ = ("findings", "summary", "profile", "pending_rules")
+
+    def __init__(
+        self,
+        findings: List[CompactFinding],
+        summary: Dict[str, int],
+        profile: Optional[List[RuleProfile]] = None,
+        pending_rules: Optional[List[str]] = None,
+    ) -> None:
+        self.findings = findings
+        self.summary = summary
+        self.profile = profile
+        self.pending_rules = pending_rules or []
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.pending_rules)
+
+    def __len__(self) -> int:
+        return len(self.findings)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same shape as to_result().model_dump(); messages are rendered here, once."""
+        return {
+            "findings": [f.to_dict() for f in self.findings],
+            "summary": dict(self.summary),
+            "profile": None if self.profile is None else [p.model_dump() for p in self.profile],
+            "partial": self.partial,
+            "pendingRules": list(self.pending_rules),
+        }
+
+    def to_result(self) -> EvaluationResult:
+        return EvaluationResult(
+            findings=[f.to_finding() for f in self.findings],
+            summary=dict(self.summary),
+            profile=self.profile,
+            partial=self.partial,
+            pendingRules=list(self.pending_rules),
+        )
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Set
+
+from otm_model.types import OTM
+from .columns import iter_mask
+
+
+class CoverageIndex:
+    """Threat / mitigation coverage of an OTM, with threat sets held as int bitsets.
+
+    A threat applies to the entities listed in its `appliesTo`. A mitigation
+    whose `appliesTo` names a threat covers it on every entity, unless it
+    also names entities, in which case it covers the threat on those only.
+    """
+
+    __slots__ = ("threat_ids", "threat_pos", "entity_threats", "threat_mitigations", "_covered", "_covered_on")
+
+    def __init__(self, otm: OTM) -> None:
+        self.threat_ids: List[str] = [t.id for t in otm.threats]
+        self.threat_pos: Dict[str, int] = {tid: i for i, tid in enumerate(self.threat_ids)}
+        # entity id -> bitset of threats applying to it
+        self.entity_threats: Dict[str, int] = {}
+        for i, t in enumerate(otm.threats):
+            for eid in t.appliesTo:
+                self.entity_threats[eid] = self.entity_threats.get(eid, 0) | 1 << i
+        self.threat_mitigations: Dict[str, List[str]] = {}
+        # threats covered everywhere, and per entity by scoped mitigations
+        self._covered = 0
+        self._covered_on: Dict[str, int] = {}
+        for m in otm.mitigations:
+            threats = 0
+            entities = []
+            for ref in m.appliesTo:
+                pos = self.threat_pos.get(ref)
+                if pos is None:
+                    entities.append(ref)
+                else:
+                    threats |= 1 << pos
+                    self.threat_mitigations.setdefault(ref, []).append(m.id)
+            if not entities:
+                self._covered |= threats
+            for eid in entities:
+                self._covered_on[eid] = self._covered_on.get(eid, 0) | threats
+
+    def threats_mask(self, entity_id: str) -> int:
+        return self.entity_threats.get(entity_id, 0)
+
+    def uncovered_mask(self, entity_id: str) -> int:
+        return self.threats_mask(entity_id) & ~(self._covered | self._covered_on.get(entity_id, 0))
+
+    def threats_of(self, entity_id: str) -> List[str]:
+        return self._ids(self.threats_mask(entity_id))
+
+    def uncovered_threats_of(self, entity_id: str) -> List[str]:
+        return self._ids(self.uncovered_mask(entity_id))
+
+    def mitigations_of(self, threat_id: str) -> List[str]:
+        return list(self.threat_mitigations.get(threat_id, ()))
+
+    def uncovered_threats(self, otm: OTM) -> List[Dict[str, Any]]:
+        """Entities for `select: uncovered_threats`: threats left unmitigated on some entity."""
+        uncovered_on: Dict[int, List[str]] = {}
+        for eid in self.entity_threats:
+            for pos in iter_mask(self.uncovered_mask(eid)):
+                uncovered_on.setdefault(pos, []).append(eid)
+        out = []
+        for pos, t in enumerate(otm.threats):
+            unscoped = not t.appliesTo and not self._covered >> pos & 1
+            if pos in uncovered_on or unscoped:
+                out.append(
+                    {
+                        **t.model_dump(),
+                        "mitigations": self.mitigations_of(t.id),
+                        "uncoveredOn": uncovered_on.get(pos, []),
+                    }
+                )
+        return out
+
+    def targets(self, otm: OTM) -> Dict[str, Set[str]]:
+        """Threat / mitigation id -> entity ids whose coverage depends on it."""
+        out: Dict[str, Set[str]] = {t.id: set(t.appliesTo) for t in otm.threats}
+        for m in otm.mitigations:
+            entities = out.setdefault(m.id, set())
+            for ref in m.appliesTo:
+                pos = self.threat_pos.get(ref)
+                if pos is None:
+                    entities.add(ref)
+                else:
+                    entities.update(otm.threats[pos].appliesTo)
+        return out
+
+    def _ids(self, mask: int) -> List[str]:
+        return [self.threat_ids[i] for i in iter_mask(mask)]
+
+
+def index_coverage(otm: OTM) -> CoverageIndex:
+    return CoverageIndex(otm)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from pydantic import BaseModel, Field
+
+from otm_model.types import OTM
+from .compact import CompactFinding, CompactResult
+from .incremental import ChangeSet, IncrementalEvaluator
+from .merge import FindingLike, _field
+from .model import EvaluationResult, Finding, Rule
+
+# OTM collections compared entity by entity; anything else marks the document itself
+_DIFFED_COLLECTIONS = ("trustZones", "components", "dataflows", "threats", "mitigations")
+
+
+class ResultDiff(BaseModel):
+    """Findings of a head evaluation classified against a base evaluation."""
+
+    new: List[Finding] = Field(default_factory=list)
+    fixed: List[Finding] = Field(default_factory=list)
+    unchanged: List[Finding] = Field(default_factory=list)
+
+    def counts(self) -> Dict[str, int]:
+        return {"new": len(self.new), "fixed": len(self.fixed), "unchanged": len(self.unchanged)}
+
+
+def result_key(f: FindingLike) -> Tuple[str, str, str]:
+    """Identity of an engine finding between two evaluations: rule and entity.
+
+    Unlike fingerprint(), which matches findings across tools by title, two
+    rules sharing a title on one entity stay distinct.
+    """
+    return (str(_field(f, "ruleId")), str(_field(f, "entityType")), str(_field(f, "entityId")))
+
+
+def _by_key(findings: EvaluationResult | CompactResult | Iterable[FindingLike]) -> Dict[Tuple[str, str, str], List[FindingLike]]:
+    if isinstance(findings, (EvaluationResult, CompactResult)):
+        findings = findings.findings
+    out: Dict[Tuple[str, str, str], List[FindingLike]] = {}
+    for f in findings:
+        out.setdefault(result_key(f), []).append(f)
+    return out
+
+
+def _as_finding(f: FindingLike) -> Finding:
+    if isinstance(f, Finding):
+        return f
+    if isinstance(f, CompactFinding):
+        return f.to_finding()
+    return Finding.model_validate(f)
+
+
+def diff_results(
+    old: EvaluationResult | CompactResult | Iterable[FindingLike],
+    new: EvaluationResult | CompactResult | Iterable[FindingLike],
+) -> ResultDiff:
+    """Split findings into new / fixed / unchanged by result_key().
+
+    Each side is indexed once; `new` and `unchanged` keep the order of
+    `new`, `fixed` the order of `old`. Unchanged findings are reported as
+    they appear in `new`. Findings sharing a key are paired off in order,
+    so a key reported twice in `new` and once in `old` counts one of each.
+    """
+    before = _by_key(old)
+    after = _by_key(new)
+    diff = ResultDiff()
+    for key, found in after.items():
+        paired = len(before.get(key, ()))
+        diff.unchanged.extend(_as_finding(f) for f in found[:paired])
+        diff.new.extend(_as_finding(f) for f in found[paired:])
+    for key, found in before.items():
+        diff.fixed.extend(_as_finding(f) for f in found[len(after.get(key, ())) :])
+    return diff
+
+
+def _diff_collection(old: Sequence[BaseModel], new: Sequence[BaseModel], changes: ChangeSet) -> None:
+    before = {e.id: e for e in old}  # type: ignore[attr-defined]
+    after = {e.id: e for e in new}  # type: ignore[attr-defined]
+    changes.added.update(after.keys() - before.keys())
+    changes.removed.update(before.keys() - after.keys())
+    changes.modified.update(eid for eid in after.keys() & before.keys() if after[eid] != before[eid])
+
+
+def diff_otm(old: OTM, new: OTM) -> ChangeSet:
+    """Entity-level ChangeSet between two OTM versions.
+
+    Trust zones, components, dataflows, threats and mitigations are compared
+    by id; a change to any other part of the document is recorded as a
+    modified "otm".
+    """
+    changes = ChangeSet()
+    for name in _DIFFED_COLLECTIONS:
+        _diff_collection(getattr(old, name), getattr(new, name), changes)
+    rest = set(OTM.model_fields) - set(_DIFFED_COLLECTIONS)
+    if any(getattr(old, name) != getattr(new, name) for name in rest):
+        changes.modified.add("otm")
+    return changes
+
+
+def evaluate_diff(old: OTM, new: OTM, rules: List[Rule]) -> ResultDiff:
+    """Evaluate base and head, re-running head rules only for entities that differ."""
+    evaluator = IncrementalEvaluator(rules)
+    base = evaluator.evaluate(old)
+    head = evaluator.update(new, diff_otm(old, new))
+    return diff_results(base, head)
@@ -1,8 +1,32 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Set
 
 import jmespath
+from jmespath import functions
+from jmespath.exceptions import JMESPathError
+from jmespath.parser import ParsedResult
+
+from otm_model.types import OTM
+from .columns import EntityColumns
+from .coverage import CoverageIndex, index_coverage
+from .index import OtmIndex, index_otm
+
+# Upper bound on distinct `where` expressions kept compiled across evaluate() calls.
+WHERE_CACHE_SIZE = 1024
+
+
+class RuleCompileError(ValueError):
+    """Raised when a rule expression cannot be compiled."""
+
+
+@lru_cache(maxsize=WHERE_CACHE_SIZE)
+def compile_where(where: str) -> ParsedResult:
+    try:
+        return jmespath.compile(where)
+    except JMESPathError as exc:
+        raise RuleCompileError(f"invalid where expression {where!r}: {exc}") from exc
 
 
 def build_context(functions: Dict[str, Callable[..., Any]] | None = None) -> Dict[str, Any]:
@@ -12,18 +36,213 @@ def build_context(functions: Dict[str, Callable[..., Any]] | None = None) -> Dic
     return ctx
 
 
-def evaluate_where(where: str | None, obj: dict[str, Any], ctx: dict[str, Any]) -> bool:
-    if not where:
-        return True
-    # Expose ctx as top-level variables in the expression via jmespath.Options
-    # jmespath doesn't support functions directly; keep MVP simple by allowing
-    # access to ctx values through `ctx` variable.
+class RuleFunctions(functions.Functions):
+    """JMESPath functions available to rule expressions, backed by an OtmIndex
+    and a CoverageIndex.
+
+    Lookups are O(1) per entity; `@` inside a `where` clause is the entity.
+    """
+
+    def __init__(self, index: OtmIndex, coverage: CoverageIndex | None = None) -> None:
+        self.index = index
+        self.coverage = coverage
+
+    @functions.signature({"types": ["object"]})
+    def _func_cross_trust_zone(self, obj: dict[str, Any]) -> bool:
+        return self.index.crosses_trust_zone(obj)
+
+    @functions.signature({"types": ["object"]}, {"types": ["string"]})
+    def _func_has_tag(self, obj: dict[str, Any], tag: str) -> bool:
+        return tag in (obj.get("tags") or [])
+
+    @functions.signature({"types": ["string", "null"]})
+    def _func_trust_zone(self, component_id: str | None) -> str | None:
+        if component_id is None:
+            return None
+        return self.index.component_zone.get(component_id)
+
+    @functions.signature({"types": ["string"]})
+    def _func_threats_of(self, entity_id: str) -> List[str]:
+        return self.coverage.threats_of(entity_id) if self.coverage else []
+
+    @functions.signature({"types": ["string"]})
+    def _func_uncovered_threats_of(self, entity_id: str) -> List[str]:
+        return self.coverage.uncovered_threats_of(entity_id) if self.coverage else []
+
+    @functions.signature({"types": ["string"]})
+    def _func_mitigations_of(self, threat_id: str) -> List[str]:
+        return self.coverage.mitigations_of(threat_id) if self.coverage else []
+
+
+class ExprContext:
+    """Per-evaluation expression state: the `ctx` variable and JMESPath options."""
+
+    __slots__ = ("variables", "options")
+
+    def __init__(
+        self,
+        variables: Dict[str, Any] | None = None,
+        custom_functions: functions.Functions | None = None,
+    ) -> None:
+        self.variables = variables if variables is not None else {}
+        self.options = jmespath.Options(custom_functions=custom_functions) if custom_functions else None
+
+
+def build_rule_context(otm: OTM, coverage: CoverageIndex | None = None) -> ExprContext:
+    coverage = coverage if coverage is not None else index_coverage(otm)
+    return ExprContext(build_context(), RuleFunctions(index_otm(otm), coverage))
+
+
+def build_scope(obj: dict[str, Any], ctx: dict[str, Any]) -> Dict[str, Any]:
+    # Expose ctx values through the `ctx` variable; callable helpers are
+    # registered as JMESPath functions (see RuleFunctions).
     data = {"obj": obj, "ctx": ctx}
     # Allow expressions to reference `obj` fields directly (shallow copy)
     data.update(obj)
+    return data
+
+
+def match_where(where: str | None, scope: dict[str, Any], options: jmespath.Options | None = None) -> bool:
+    """Evaluate `where` against a scope built once per entity by build_scope."""
+    if not where:
+        return True
+    # Compile errors surface to the caller; rules are validated at load time.
+    expression = compile_where(where)
     try:
-        result = jmespath.search(where, data)
+        result = expression.search(scope, options)
         return bool(result)
     except Exception:
         return False
 
+
+def evaluate_where(
+    where: str | None,
+    obj: dict[str, Any],
+    ctx: dict[str, Any],
+    options: jmespath.Options | None = None,
+) -> bool:
+    if not where:
+        return True
+    return match_where(where, build_scope(obj, ctx), options)
+
+
+# Built-in JMESPath functions whose result depends only on their arguments.
+_PURE_FUNCTIONS = frozenset(
+    {
+        "abs", "avg", "ceil", "contains", "ends_with", "floor", "join", "keys", "length", "map", "max",
+        "max_by", "merge", "min", "min_by", "not_null", "reverse", "sort", "sort_by", "starts_with",
+        "sum", "to_array", "to_number", "to_string", "type", "values",
+    }
+)
+_SCALAR_NODES = frozenset({"comparator", "field", "function_expression", "literal", "expref"})
+_RESERVED_FIELDS = frozenset({"obj", "ctx"})
+
+
+class ColumnPredicate:
+    """A `where` clause recognised as a boolean combination of single-field tests.
+
+    mask() evaluates it over EntityColumns as an int bitset of matching rows,
+    or returns None when the columns cannot represent a field or a test
+    raises for some value, in which case the caller falls back to
+    per-entity evaluation.
+    """
+
+    __slots__ = ("kind", "field", "value", "children", "strict", "_expression")
+
+    def __init__(
+        self,
+        kind: str,
+        field: Optional[str] = None,
+        value: Any = None,
+        children: Optional[List["ColumnPredicate"]] = None,
+        node: Optional[dict[str, Any]] = None,
+        strict: bool = False,
+    ) -> None:
+        self.kind = kind  # "test" | "member" | "and" | "or" | "not"
+        self.field = field
+        self.value = value
+        self.children = children or []
+        # operands of and/or/not must yield booleans: JMESPath truthiness of
+        # other values (0 is true) differs from the bool() applied at the root
+        self.strict = strict
+        self._expression = ParsedResult("", node) if node is not None else None
+
+    def test(self, value: Any) -> bool:
+        """Truth of the test for one field value; JMESPath errors propagate."""
+        data = {} if self.field is None else {self.field: value}
+        result = self._expression.search(data)  # type: ignore[union-attr]
+        if self.strict and not isinstance(result, bool):
+            raise TypeError(f"non-boolean operand {result!r}")
+        return bool(result)
+
+    def mask(self, columns: EntityColumns) -> Optional[int]:
+        if self.kind in ("and", "or", "not"):
+            masks = [c.mask(columns) for c in self.children]
+            if any(m is None for m in masks):
+                return None
+            if self.kind == "not":
+                return columns.all & ~masks[0]  # type: ignore[operator]
+            out = masks[0]
+            for m in masks[1:]:
+                out = (out & m) if self.kind == "and" else (out | m)  # type: ignore[operator]
+            return out
+        # A test that raises fails the whole expression for that entity, which
+        # and/or/not over masks cannot express: leave such rules to match_where.
+        try:
+            if self.field is None:
+                return columns.all if self.test(None) else 0
+            if self.kind == "member":
+                index = columns.members(self.field)
+                if index is not None:
+                    return index.get(self.value, 0)
+            column = columns.column(self.field)
+            if column is None:
+                return None
+            return column.mask_where(self.test)
+        except Exception:
+            return None
+
+
+def _fields_of(node: dict[str, Any], out: Set[str]) -> bool:
+    """Collect top-level field names; False if the subtree is not a pure single-scope test."""
+    kind = node.get("type")
+    if kind == "field":
+        out.add(node["value"])
+        return True
+    if kind == "literal":
+        return True
+    if kind == "function_expression" and node.get("value") not in _PURE_FUNCTIONS:
+        return False
+    if kind not in _SCALAR_NODES and kind not in ("and_expression", "or_expression", "not_expression"):
+        return False
+    return all(_fields_of(child, out) for child in node.get("children", []))
+
+
+def _classify(node: dict[str, Any], strict: bool = False) -> Optional[ColumnPredicate]:
+    kind = node.get("type")
+    if kind in ("and_expression", "or_expression", "not_expression"):
+        children = [_classify(c, strict=True) for c in node["children"]]
+        if any(c is None for c in children):
+            return None
+        return ColumnPredicate(kind.split("_")[0], children=children)  # type: ignore[arg-type]
+    fields: Set[str] = set()
+    if not _fields_of(node, fields) or len(fields) > 1 or fields & _RESERVED_FIELDS:
+        return None
+    field = next(iter(fields), None)
+    children = node.get("children") or []
+    if (
+        kind == "function_expression"
+        and node.get("value") == "contains"
+        and len(children) == 2
+        and children[0].get("type") == "field"
+        and children[1].get("type") == "literal"
+    ):
+        return ColumnPredicate("member", field=field, value=children[1]["value"], node=node, strict=strict)
+    return ColumnPredicate("test", field=field, node=node, strict=strict)
+
+
+@lru_cache(maxsize=WHERE_CACHE_SIZE)
+def classify_where(where: str) -> Optional[ColumnPredicate]:
+    """Recognise `where` clauses (==, !=, contains, tag membership, and/or/not of
+    those) that can be evaluated column-wise over all entities at once."""
+    return _classify(compile_where(where).parsed)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .columns import iter_mask
+
+
+class DataflowGraph:
+    """Component graph induced by dataflows, with adjacency lists and a bitset closure.
+
+    Nodes are component positions, edges carry the position of their
+    dataflow. Built once per evaluation (per `via` filter) and shared by all
+    rules using a graph selector.
+    """
+
+    def __init__(self, component_ids: Sequence[str], edges: Sequence[Tuple[int, int, int]]) -> None:
+        self.component_ids = list(component_ids)
+        n = len(self.component_ids)
+        # node -> [(neighbour, dataflow position)]
+        self.out_edges: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+        self.in_edges: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+        for src, dst, flow in edges:
+            self.out_edges[src].append((dst, flow))
+            self.in_edges[dst].append((src, flow))
+        self._closure: Optional[List[int]] = None
+
+    @classmethod
+    def build(
+        cls,
+        component_ids: Sequence[str],
+        flows: Sequence[Tuple[str, str]],
+        keep: Optional[Sequence[bool]] = None,
+    ) -> "DataflowGraph":
+        """Build from (source, destination) id pairs; `keep[i]` false drops flow i."""
+        position: Dict[str, int] = {cid: i for i, cid in enumerate(component_ids)}
+        edges: List[Tuple[int, int, int]] = []
+        for i, (src, dst) in enumerate(flows):
+            if keep is not None and not keep[i]:
+                continue
+            s, d = position.get(src), position.get(dst)
+            if s is not None and d is not None:
+                edges.append((s, d, i))
+        return cls(component_ids, edges)
+
+    def __len__(self) -> int:
+        return len(self.component_ids)
+
+    def closure(self) -> List[int]:
+        """reach[v] is a bitset of nodes reachable from v by one or more edges."""
+        if self._closure is None:
+            self._closure = self._compute_closure()
+        return self._closure
+
+    def _compute_closure(self) -> List[int]:
+        comp_of, components = self._strongly_connected()
+        # Tarjan emits components in reverse topological order: successors first.
+        comp_reach: List[int] = [0] * len(components)
+        for c, members in enumerate(components):
+            reach = 0
+            cyclic = len(members) > 1
+            for v in members:
+                for w, _ in self.out_edges[v]:
+                    cw = comp_of[w]
+                    if cw == c:
+                        cyclic = True
+                    else:
+                        reach |= comp_reach[cw] | _members_mask(components[cw])
+            comp_reach[c] = reach | (_members_mask(members) if cyclic else 0)
+        return [comp_reach[comp_of[v]] for v in range(len(self))]
+
+    def _strongly_connected(self) -> Tuple[List[int], List[List[int]]]:
+        """Iterative Tarjan; returns node -> component and components in reverse topological order."""
+        n = len(self)
+        index = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        comp_of = [-1] * n
+        components: List[List[int]] = []
+        stack: List[int] = []
+        counter = 0
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            work: List[Tuple[int, int]] = [(root, 0)]
+            while work:
+                v, i = work.pop()
+                if i == 0:
+                    index[v] = low[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    on_stack[v] = True
+                edges = self.out_edges[v]
+                while i < len(edges):
+                    w = edges[i][0]
+                    i += 1
+                    if index[w] == -1:
+                        work.append((v, i))
+                        work.append((w, 0))
+                        break
+                    if on_stack[w]:
+                        low[v] = min(low[v], index[w])
+                else:
+                    if low[v] == index[v]:
+                        members: List[int] = []
+                        while True:
+                            w = stack.pop()
+                            on_stack[w] = False
+                            comp_of[w] = len(components)
+                            members.append(w)
+                            if w == v:
+                                break
+                        components.append(members)
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[v])
+        return comp_of, components
+
+    def reachable_from(self, v: int) -> List[int]:
+        return [w for w in iter_mask(self.closure()[v]) if w != v]
+
+    def shortest_paths_from(self, v: int) -> Dict[int, Tuple[List[int], List[int]]]:
+        """BFS from `v`: target -> (node path, dataflow path) for every reachable target."""
+        parent: Dict[int, Tuple[int, int]] = {}
+        queue = deque([v])
+        seen = {v}
+        while queue:
+            u = queue.popleft()
+            for w, flow in self.out_edges[u]:
+                if w not in seen:
+                    seen.add(w)
+                    parent[w] = (u, flow)
+                    queue.append(w)
+        paths: Dict[int, Tuple[List[int], List[int]]] = {}
+        for target in parent:
+            nodes, flows = [target], []
+            cur = target
+            while cur != v:
+                prev, flow = parent[cur]
+                flows.append(flow)
+                nodes.append(prev)
+                cur = prev
+            paths[target] = (nodes[::-1], flows[::-1])
+        return paths
+
+
+def _members_mask(members: List[int]) -> int:
+    mask = 0
+    for v in members:
+        mask |= 1 << v
+    return mask
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import Dict, List, Set, Tuple
+
+from pydantic import BaseModel, Field
+
+from otm_model.types import OTM
+from .coverage import index_coverage
+from .model import EvaluationResult, Finding, Rule
+from .runner import evaluate_group, group_rules_by_select, summarize
+from .snapshot import SELECT_ENTITY_TYPES, EntitySnapshot, selection_key
+
+# Selects whose results can be updated entity by entity; the rest are re-run in full.
+_PER_ENTITY = frozenset({"components", "dataflows"})
+
+
+class ChangeSet(BaseModel):
+    """Ids of OTM entities (components, dataflows, trust zones) touched by an edit."""
+
+    added: Set[str] = Field(default_factory=set)
+    removed: Set[str] = Field(default_factory=set)
+    modified: Set[str] = Field(default_factory=set)
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.modified)
+
+
+class IncrementalEvaluator:
+    """Keeps the last evaluation keyed by entity id and re-runs only affected pairs.
+
+    `select: otm`, graph-select and coverage rules depend on the whole
+    document and are re-run in full on every non-empty change set. Changed
+    threat and mitigation ids mark the entities they apply to as touched.
+    """
+
+    def __init__(self, rules: List[Rule]) -> None:
+        self.rules = rules
+        self._active = [(pos, r) for pos, r in enumerate(rules) if r.enabled and r.select in SELECT_ENTITY_TYPES]
+        self._groups = group_rules_by_select(self._active)
+        # rule position -> entity id -> findings
+        self._store: Dict[int, Dict[str, List[Finding]]] = {}
+        self._otm: OTM | None = None
+        # dataflow id -> (source, destination) as of the last evaluation
+        self._endpoints: Dict[str, Tuple[str, str]] = {}
+        # threat / mitigation id -> entity ids it applied to, as of the last evaluation
+        self._coverage_targets: Dict[str, Set[str]] = {}
+        # entity ids, in order, of the last full run of each whole-document selection
+        self._global_order: Dict[str, List[str]] = {}
+
+    def evaluate(self, otm: OTM) -> EvaluationResult:
+        snapshot = EntitySnapshot(otm)
+        self._store = {pos: {} for pos, _ in self._active}
+        for key, group in self._groups.items():
+            entities = snapshot.entities(key)
+            if key not in _PER_ENTITY:
+                self._global_order[key] = [str(e.get("id", "otm")) for e in entities]
+            self._absorb(evaluate_group(group, entities, _entity_type(group), snapshot.context))
+        self._remember(otm, snapshot.coverage.targets(otm))
+        return self._result(otm)
+
+    def update(self, otm: OTM, changes: ChangeSet) -> EvaluationResult:
+        if self._otm is None:
+            return self.evaluate(otm)
+        if changes.is_empty():
+            self._remember(otm)
+            return self._result(otm)
+
+        snapshot = EntitySnapshot(otm)
+        touched = changes.added | changes.removed | changes.modified
+        # threat / mitigation edits change the coverage of the entities they apply to
+        targets = snapshot.coverage.targets(otm)
+        for ref in list(touched):
+            touched |= self._coverage_targets.get(ref, set()) | targets.get(ref, set())
+        affected = _affected_ids(otm, touched, self._endpoints)
+        for key, group in self._groups.items():
+            if key in _PER_ENTITY:
+                stale = affected[key] | changes.removed
+                entities = [e.model_dump() for e in getattr(otm, key) if e.id in affected[key]]
+                for pos, _ in group:
+                    store = self._store[pos]
+                    for eid in stale:
+                        store.pop(eid, None)
+            else:
+                entities = snapshot.entities(key)
+                self._global_order[key] = [str(e.get("id", "otm")) for e in entities]
+                for pos, _ in group:
+                    self._store[pos] = {}
+            self._absorb(evaluate_group(group, entities, _entity_type(group), snapshot.context))
+        self._remember(otm, targets)
+        return self._result(otm)
+
+    def _remember(self, otm: OTM, coverage_targets: Dict[str, Set[str]] | None = None) -> None:
+        self._otm = otm
+        self._endpoints = {d.id: (d.source, d.destination) for d in otm.dataflows}
+        if coverage_targets is None:
+            coverage_targets = index_coverage(otm).targets(otm)
+        self._coverage_targets = coverage_targets
+
+    def _absorb(self, fresh: Dict[int, List[Finding]]) -> None:
+        for pos, found in fresh.items():
+            store = self._store[pos]
+            for f in found:
+                store.setdefault(f.entityId, []).append(f)
+
+    def _result(self, otm: OTM) -> EvaluationResult:
+        order = {
+            "components": [c.id for c in otm.components],
+            "dataflows": [d.id for d in otm.dataflows],
+            **self._global_order,
+        }
+        findings: List[Finding] = []
+        for pos, rule in self._active:
+            store = self._store[pos]
+            seen: Set[str] = set()
+            for eid in order[selection_key(rule)]:
+                if eid in seen:
+                    continue
+                seen.add(eid)
+                findings.extend(store.get(eid, ()))
+        return EvaluationResult(findings=findings, summary=summarize(findings))
+
+
+def _entity_type(group: List[Tuple[int, Rule]]) -> str:
+    return SELECT_ENTITY_TYPES[group[0][1].select]
+
+
+def _affected_ids(
+    otm: OTM,
+    touched: Set[str],
+    previous_endpoints: Dict[str, Tuple[str, str]],
+) -> Dict[str, Set[str]]:
+    """Expand touched ids to the entities whose rule results may change.
+
+    Dataflow results depend on the trust zones of their endpoints; component
+    results depend on their own zone and, through cross_trust_zone(), on the
+    zones at the far end of their dataflows.
+    """
+    zone_changed = {c.id for c in otm.components if c.id in touched or (c.trustZone or "") in touched}
+    endpoints = touched | zone_changed
+    components = set(zone_changed)
+    dataflows: Set[str] = set()
+    for d in otm.dataflows:
+        if d.id in touched or d.source in endpoints or d.destination in endpoints:
+            dataflows.add(d.id)
+            components.update((d.source, d.destination))
+    for did in touched:
+        if did in previous_endpoints:
+            components.update(previous_endpoints[did])
+    return {"components": components, "dataflows": dataflows}
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import weakref
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from otm_model.index import OtmIndex as SharedIndex
+from otm_model.index import index_of
+from otm_model.types import OTM, Dataflow
+
+
+class OtmIndex:
+    """Trust-zone lookups for rule functions, derived from otm_model's index_of()."""
+
+    __slots__ = ("id_to_component", "id_to_trustzone", "component_zone", "dataflow_zones", "cross_zone_components")
+
+    def __init__(self, shared: SharedIndex, dataflows: Iterable[Dataflow]) -> None:
+        self.id_to_component: Dict[str, Any] = shared.components
+        self.id_to_trustzone: Dict[str, Any] = shared.trust_zones
+        self.component_zone: Dict[str, Optional[str]] = shared.component_zone
+        # dataflow id -> (source zone, destination zone)
+        self.dataflow_zones: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        # components that are an endpoint of at least one cross-zone dataflow
+        self.cross_zone_components: Set[str] = set()
+        component_zone = self.component_zone
+        for d in dataflows:
+            src, dst = component_zone.get(d.source), component_zone.get(d.destination)
+            self.dataflow_zones[d.id] = (src, dst)
+            if src is not None and dst is not None and src != dst:
+                self.cross_zone_components.add(d.source)
+                self.cross_zone_components.add(d.destination)
+
+    def crosses_trust_zone(self, obj: dict[str, Any]) -> bool:
+        if "source" in obj and "destination" in obj:
+            zones = self.dataflow_zones.get(str(obj.get("id")))
+            if zones is None:
+                zones = (self.component_zone.get(obj["source"]), self.component_zone.get(obj["destination"]))
+            src, dst = zones
+            return src is not None and dst is not None and src != dst
+        return obj.get("id") in self.cross_zone_components
+
+
+# keyed by the shared index, so entries go away when index_of() rebuilds or drops it
+_DERIVED: "weakref.WeakKeyDictionary[SharedIndex, OtmIndex]" = weakref.WeakKeyDictionary()
+
+
+def index_otm(otm: OTM) -> OtmIndex:
+    shared = index_of(otm)
+    index = _DERIVED.get(shared)
+    if index is None:
+        index = _DERIVED[shared] = OtmIndex(shared, otm.dataflows)
+    return index
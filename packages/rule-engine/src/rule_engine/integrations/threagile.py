@@ -1,9 +1,17 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import json
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Mapping, Optional
 
+from otm_model.types import OTM
 from ..model import Finding
 
+# Threagile severities that have no counterpart in Rule.severity
+_SEVERITY_ALIASES = {"elevated": "high"}
+# Risk fields kept as evidence by the streaming parser
+_EVIDENCE_FIELDS = ("synthetic_id", "category", "risk_status", "exploitation_likelihood", "exploitation_impact")
+
 
 def parse_threagile_report(report: Dict[str, Any]) -> List[Finding]:
     """Parse a minimal Threagile-like report JSON into Finding list.
@@ -29,3 +37,156 @@ def parse_threagile_report(report: Dict[str, Any]) -> List[Finding]:
         )
     return out
 
+
+def build_asset_index(model: OTM | Mapping[str, Any]) -> Dict[str, str]:
+    """Map Threagile technical asset ids (and titles) to OTM component ids.
+
+    Accepts the OTM produced by threagile_to_otm or the Threagile model
+    itself, where assets are keyed by title and carry their own `id`.
+    """
+    index: Dict[str, str] = {}
+    if isinstance(model, OTM):
+        for c in model.components:
+            index.setdefault(c.name, c.id)
+        for c in model.components:
+            index[c.id] = c.id
+        return index
+    assets = model.get("technical_assets") or {}
+    if isinstance(assets, dict):
+        for key, asset in assets.items():
+            index[str(key)] = str(key)
+            if isinstance(asset, dict) and asset.get("id"):
+                index.setdefault(str(asset["id"]), str(key))
+    return index
+
+
+def iter_threagile_risks(
+    source: str | Path | IO[str],
+    asset_index: Optional[Mapping[str, str]] = None,
+    chunk_size: int = 1 << 16,
+) -> Iterator[Finding]:
+    """Stream findings from a Threagile `risks.json` without loading it whole.
+
+    The file may be a bare array of risks or an object with a `risks` array.
+    Asset ids are translated through `asset_index` (see build_asset_index);
+    evidence keeps only a few identifying fields. The result can be passed
+    straight to merge_findings as its external stream.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "r", encoding="utf-8") as fp:
+            yield from iter_threagile_risks(fp, asset_index, chunk_size)
+        return
+    index = asset_index or {}
+    for risk in _JsonStream(source, chunk_size).risks():
+        if isinstance(risk, dict):
+            yield _risk_finding(risk, index)
+
+
+def _risk_finding(r: Dict[str, Any], index: Mapping[str, str]) -> Finding:
+    asset = str(r.get("entityId") or r.get("most_relevant_technical_asset") or r.get("technical_asset") or "unknown")
+    severity = (r.get("severity") or "medium").lower()
+    # Constructed without validation: the fields are normalised above and
+    # most findings are discarded again by merge_findings.
+    return Finding.model_construct(
+        ruleId=r.get("ruleId") or r.get("category") or r.get("id") or "threagile",
+        title=r.get("title") or "risk",
+        severity=_SEVERITY_ALIASES.get(severity, severity),
+        entityType=r.get("entityType") or "component",
+        entityId=index.get(asset, asset),
+        message=r.get("message") or r.get("description") or r.get("title") or "",
+        remediation=r.get("remediation"),
+        tags=list(r.get("tags") or []),
+        evidence={k: r[k] for k in _EVIDENCE_FIELDS if k in r},
+        sources=[],
+    )
+
+
+# characters that may follow a complete JSON number
+_DELIMITERS = frozenset(",]} \t\r\n")
+
+
+class _JsonStream:
+    """Incremental reader yielding the elements of the top-level risks array."""
+
+    def __init__(self, fp: IO[str], chunk_size: int) -> None:
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos : self.pos + 1]
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise ValueError(f"expected {char!r} at offset {self.pos} of risks stream")
+        self.pos += 1
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # an incomplete value at the end of the buffer; read more and retry
+                if not self._fill():
+                    raise
+                continue
+            # a number cut by the chunk boundary ("12." or "1e") decodes as its
+            # prefix: only accept it once a delimiter follows
+            if (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and (end == len(self.buf) or self.buf[end] not in _DELIMITERS)
+                and self._fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+    def _array(self) -> Iterator[Any]:
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._peek() == ",":
+                self.pos += 1
+                continue
+            self._expect("]")
+            return
+
+    def risks(self) -> Iterator[Any]:
+        head = self._peek()
+        if head == "[":
+            yield from self._array()
+            return
+        self._expect("{")
+        while self._peek() != "}":
+            key = self._value()
+            self._expect(":")
+            if key == "risks":
+                yield from self._array()
+            else:
+                self._value()
+            if self._peek() == ",":
+                self.pos += 1
+        self.pos += 1
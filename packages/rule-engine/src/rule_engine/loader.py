@@ -1,21 +1,111 @@
 from __future__ import annotations
 
+import hashlib
+import marshal
+import sys
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 import yaml
 
+from .expr import compile_where
+from .message import compile_message
 from .model import Rule
 
+try:  # libyaml bindings are several times faster when available
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
 
-def load_rules_from_yaml_dir(dir_path: str | Path) -> List[Rule]:
-    path = Path(dir_path)
+# Header of serialized rule packs; marshal output is tied to the interpreter version.
+PACK_MAGIC = b"TFRULEPACK1" + f"-py{sys.version_info[0]}{sys.version_info[1]}\n".encode()
+
+# resolved directory -> (stat signature, validated rules)
+_PACK_CACHE: Dict[str, Tuple[Tuple[Tuple[str, int, int], ...], List[Rule]]] = {}
+
+
+def _rule_files(path: Path) -> List[Path]:
+    return sorted(path.glob("*.yaml"))
+
+
+def _stat_signature(files: List[Path]) -> Tuple[Tuple[str, int, int], ...]:
+    out = []
+    for p in files:
+        st = p.stat()
+        out.append((p.name, st.st_mtime_ns, st.st_size))
+    return tuple(out)
+
+
+def _parse_rule_files(files: List[Path]) -> List[Rule]:
     rules: list[Rule] = []
-    for p in sorted(path.glob("*.yaml")):
-        data = yaml.safe_load(p.read_text(encoding="utf-8"))
+    for p in files:
+        data = yaml.load(p.read_text(encoding="utf-8"), Loader=_YamlLoader)
         if isinstance(data, dict):
             rules.append(Rule.model_validate(data))
         elif isinstance(data, list):
             rules.extend(Rule.model_validate(d) for d in data)
     return rules
 
+
+def load_rules_from_yaml_dir(dir_path: str | Path) -> List[Rule]:
+    """Load and validate every `*.yaml` rule file in `dir_path`.
+
+    The parsed pack is cached in memory and reused until a file is added,
+    removed or changes size/mtime.
+    """
+    path = Path(dir_path)
+    files = _rule_files(path)
+    key = str(path.resolve())
+    signature = _stat_signature(files)
+    cached = _PACK_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        return list(cached[1])
+    rules = _parse_rule_files(files)
+    _PACK_CACHE[key] = (signature, rules)
+    return list(rules)
+
+
+def clear_rule_cache() -> None:
+    _PACK_CACHE.clear()
+
+
+def rule_pack_digest(dir_path: str | Path) -> str:
+    """sha256 over the names and contents of the rule files in `dir_path`."""
+    h = hashlib.sha256()
+    for p in _rule_files(Path(dir_path)):
+        h.update(p.name.encode("utf-8") + b"\0")
+        h.update(p.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def save_rule_pack(dir_path: str | Path, pack_path: str | Path) -> str:
+    """Serialize the validated rules of `dir_path` into one binary file; returns its digest."""
+    digest = rule_pack_digest(dir_path)
+    rules = load_rules_from_yaml_dir(dir_path)
+    payload = marshal.dumps({"digest": digest, "rules": [r.model_dump() for r in rules]})
+    Path(pack_path).write_bytes(PACK_MAGIC + payload)
+    return digest
+
+
+def load_rule_pack(pack_path: str | Path, dir_path: str | Path | None = None) -> Optional[List[Rule]]:
+    """Load a pack written by save_rule_pack without re-parsing YAML or re-validating.
+
+    Returns None when the file is not a pack for this interpreter or, if
+    `dir_path` is given, when its rules no longer match the directory.
+    """
+    p = Path(pack_path)
+    if not p.exists():
+        return None
+    raw = p.read_bytes()
+    if not raw.startswith(PACK_MAGIC):
+        return None
+    data = marshal.loads(raw[len(PACK_MAGIC):])
+    if dir_path is not None and data.get("digest") != rule_pack_digest(dir_path):
+        return None
+    rules = [Rule.model_construct(**d) for d in data["rules"]]
+    for r in rules:
+        if r.where:
+            compile_where(r.where)
+        compile_message(r.message)
+    return rules
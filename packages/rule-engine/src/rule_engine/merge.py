@@ -1,28 +1,80 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, List
+import hashlib
+from typing import Any, Dict, Iterable, List, Tuple, Union
 
-from .model import Finding, EvaluationResult
+from .compact import CompactFinding, CompactResult
+from .model import SEVERITY_RANK, EvaluationResult, Finding
 
+FindingLike = Union[Finding, CompactFinding, Dict[str, Any]]
+
+
+def _field(f: FindingLike, name: str) -> Any:
+    return f.get(name) if isinstance(f, dict) else getattr(f, name)
+
+
+def fingerprint(f: FindingLike) -> str:
+    """Stable identity of a finding across tools and runs: sha1 of entityType, entityId and title.
+
+    The entity type keeps a component and a dataflow that share an id apart.
+    """
+    key = f"{_field(f, 'entityType')}\0{_field(f, 'entityId')}\0{_field(f, 'title')}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
 
-def merge_findings(local: EvaluationResult, external: Iterable[Finding | dict]) -> EvaluationResult:
-    merged: List[Finding] = []
-    seen: set[tuple[str, str, str]] = set()
 
-    def _coerce(f: Finding | dict) -> Finding:
-        if isinstance(f, Finding):
-            return f
-        return Finding(**f)
+def _rank(f: FindingLike) -> int:
+    return SEVERITY_RANK.get(str(_field(f, "severity")).lower(), len(SEVERITY_RANK))
 
-    for f in list(local.findings) + [ _coerce(e) for e in external ]:
-        key = (f.entityId, f.title, f.severity)
-        if key in seen:
-            continue
-        seen.add(key)
-        merged.append(f)
 
+def _materialize(f: FindingLike, sources: List[str]) -> Finding:
+    if isinstance(f, dict):
+        out = Finding.model_validate(f)
+    elif isinstance(f, CompactFinding):
+        out = f.to_finding()
+    else:
+        out = f.model_copy()
+    out.sources = sources
+    return out
+
+
+def merge_findings(
+    local: EvaluationResult | CompactResult | Iterable[FindingLike],
+    external: Iterable[FindingLike],
+    *,
+    local_source: str = "rule-engine",
+    external_source: str = "external",
+) -> EvaluationResult:
+    """Merge two finding streams, deduplicating on fingerprint().
+
+    Inputs are consumed once and may be generators. On a fingerprint
+    conflict the most severe finding wins (the earlier one on a tie) and
+    keeps the position of the first occurrence; `sources` lists every input
+    that reported it. Only surviving findings are turned into Finding models.
+    """
+    if isinstance(local, (EvaluationResult, CompactResult)):
+        local = local.findings
+    # fingerprint -> (winner, its severity rank, sources); dicts keep insertion order
+    survivors: Dict[str, Tuple[FindingLike, int, List[str]]] = {}
+    for stream, label in ((local, local_source), (external, external_source)):
+        for f in stream:
+            fp = fingerprint(f)
+            own = list(_field(f, "sources") or ()) if not isinstance(f, CompactFinding) else []
+            rank = _rank(f)
+            current = survivors.get(fp)
+            if current is None:
+                survivors[fp] = (f, rank, own or [label])
+                continue
+            _, best, sources = current
+            for s in own or [label]:
+                if s not in sources:
+                    sources.append(s)
+            if rank < best:
+                survivors[fp] = (f, rank, sources)
+
+    merged: List[Finding] = []
     summary: Dict[str, int] = {}
-    for f in merged:
-        summary[f.severity] = summary.get(f.severity, 0) + 1
+    for f, _, sources in survivors.values():
+        finding = _materialize(f, sources)
+        merged.append(finding)
+        summary[finding.severity] = summary.get(finding.severity, 0) + 1
     return EvaluationResult(findings=merged, summary=summary)
-
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import string
+from functools import lru_cache
+from typing import Any, FrozenSet, Mapping
+
+from .expr import WHERE_CACHE_SIZE, RuleCompileError
+
+_FORMATTER = string.Formatter()
+
+
+class MessageTemplate:
+    """A rule `message` parsed once; render() looks up only the fields it names.
+
+    Rendering reads the entity mapping in place (no copy), so it is cheap
+    enough to defer until a finding is serialized or displayed.
+    """
+
+    __slots__ = ("template", "fields")
+
+    def __init__(self, template: str, fields: FrozenSet[str]) -> None:
+        self.template = template
+        # top-level entity keys referenced, e.g. {"source"} for "{source[name]}"
+        self.fields = fields
+
+    def render(self, obj: Mapping[str, Any]) -> str:
+        return self.template.format_map(obj)
+
+
+def _root_field(field_name: str) -> str:
+    end = len(field_name)
+    for sep in ".[":
+        i = field_name.find(sep)
+        if i != -1:
+            end = min(end, i)
+    return field_name[:end]
+
+
+@lru_cache(maxsize=WHERE_CACHE_SIZE)
+def compile_message(template: str) -> MessageTemplate:
+    fields = set()
+    try:
+        for _, field_name, spec, _ in _FORMATTER.parse(template):
+            if field_name is None:
+                continue
+            root = _root_field(field_name)
+            if not root or root.isdigit():
+                raise RuleCompileError(f"message {template!r} uses a positional field; name an entity field")
+            fields.add(root)
+            # nested replacement fields in the format spec, e.g. "{name:{width}}"
+            for _, nested, _, _ in _FORMATTER.parse(spec or ""):
+                if nested is not None:
+                    fields.add(_root_field(nested))
+    except ValueError as exc:
+        if isinstance(exc, RuleCompileError):
+            raise
+        raise RuleCompileError(f"invalid message template {template!r}: {exc}") from exc
+    return MessageTemplate(template, frozenset(fields))
@@ -2,7 +2,14 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from .expr import compile_where
+from .message import compile_message
+from .snapshot import GRAPH_SELECTS, SELECT_FIELDS
+
+# Scheduling priority; lower runs first.
+SEVERITY_RANK: Dict[str, int] = {"critical": 0, "high": 1, "medium": 2, "low": 3, "info": 4}
 
 
 class Rule(BaseModel):
@@ -12,12 +19,37 @@ class Rule(BaseModel):
     severity: str = Field(pattern=r"^(info|low|medium|high|critical)$")
     select: str
     where: Optional[str] = None
+    # Graph selects only: keep dataflows matching this expression as edges.
+    via: Optional[str] = None
     message: str
     remediation: Optional[str] = None
     tags: List[str] = Field(default_factory=list)
     enabled: bool = True
     version: Optional[str] = None
 
+    @field_validator("where", "via")
+    @classmethod
+    def _compile_where(cls, v: Optional[str]) -> Optional[str]:
+        # Fail at load time rather than silently never matching at evaluate time.
+        if v:
+            compile_where(v)
+        return v
+
+    @model_validator(mode="after")
+    def _check_via(self) -> "Rule":
+        if self.via and self.select not in GRAPH_SELECTS:
+            raise ValueError(f"via is only supported for graph selects, not {self.select!r}")
+        return self
+
+    @model_validator(mode="after")
+    def _check_message(self) -> "Rule":
+        # Template fields must exist on the selected entities; unknown selects are skipped at evaluate time.
+        known = SELECT_FIELDS.get(self.select)
+        unknown = compile_message(self.message).fields - known if known is not None else set()
+        if unknown:
+            raise ValueError(f"message references fields not on {self.select!r} entities: {sorted(unknown)}")
+        return self
+
 
 class Finding(BaseModel):
     ruleId: str
@@ -29,9 +61,30 @@ class Finding(BaseModel):
     remediation: Optional[str] = None
     tags: List[str] = Field(default_factory=list)
     evidence: Dict[str, Any] = Field(default_factory=dict)
+    # tools that reported this finding; filled in by merge_findings
+    sources: List[str] = Field(default_factory=list)
+
+
+class RuleProfile(BaseModel):
+    ruleId: str
+    select: str
+    # wall time spent matching, summed across workers
+    seconds: float = 0.0
+    candidates: int = 0
+    matches: int = 0
+    # expression errors swallowed as "no match"
+    errors: int = 0
+    formatSeconds: float = 0.0
+    # evaluated column-wise rather than per entity
+    vectorized: bool = False
 
 
 class EvaluationResult(BaseModel):
     findings: List[Finding]
     summary: Dict[str, int] = Field(default_factory=dict)
+    profile: Optional[List[RuleProfile]] = None
+    # True when a deadline/findings budget stopped evaluation early; the ids of
+    # rules that did not run are listed in pendingRules, most severe first.
+    partial: bool = False
+    pendingRules: List[str] = Field(default_factory=list)
 
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+from otm_model.types import OTM
+from .compact import CompactResult
+from .model import EvaluationResult, Rule
+from .runner import evaluate, group_rules_by_select, match_group
+from .profiling import RuleStats
+from .snapshot import EntitySnapshot
+
+# (select, rule positions, entity start, entity stop, profile)
+Shard = Tuple[str, List[int], int, int, bool]
+
+# Per-process state installed once by the pool initializer.
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(otm: OTM, rules: List[Rule]) -> None:
+    _WORKER["rules"] = rules
+    _WORKER["snapshot"] = EntitySnapshot(otm)
+    _WORKER["ctx"] = _WORKER["snapshot"].context
+
+
+def _run_shard(shard: Shard) -> Tuple[Dict[int, List[int]], Dict[int, RuleStats] | None]:
+    select, positions, start, stop, profile = shard
+    rules: List[Rule] = _WORKER["rules"]
+    entities = _WORKER["snapshot"].entities(select)[start:stop]
+    group = [(pos, rules[pos]) for pos in positions]
+    stats: Dict[int, RuleStats] | None = {} if profile else None
+    # Only row positions travel back; the parent builds findings from its own snapshot.
+    found = match_group(group, entities, _WORKER["ctx"], stats)
+    return {pos: [start + i for i in rows] for pos, rows in found.items()}, stats
+
+
+def plan_shards(
+    groups: Dict[str, List[Tuple[int, Rule]]],
+    counts: Dict[str, int],
+    workers: int,
+    profile: bool = False,
+) -> List[Shard]:
+    """Split each select group by rules when there are enough of them, else by entities.
+
+    Shards are emitted so that, for every rule, its entity ranges appear in
+    ascending order; merging results in shard order reproduces serial output.
+    """
+    shards: List[Shard] = []
+    for select, group in groups.items():
+        positions = [pos for pos, _ in group]
+        total = counts[select]
+        if len(positions) >= workers or total < workers:
+            step = -(-len(positions) // workers)
+            for i in range(0, len(positions), step):
+                shards.append((select, positions[i : i + step], 0, total, profile))
+        else:
+            step = -(-total // workers)
+            for start in range(0, total, step):
+                shards.append((select, positions, start, min(start + step, total), profile))
+    return shards
+
+
+def match_parallel(
+    otm: OTM,
+    snapshot: EntitySnapshot,
+    rules: List[Rule],
+    active: List[Tuple[int, Rule]],
+    workers: int,
+    stats: Dict[int, RuleStats] | None = None,
+) -> Dict[int, List[int]]:
+    groups = group_rules_by_select(active)
+    shards = plan_shards(groups, {s: snapshot.count(s) for s in groups}, workers, stats is not None)
+
+    matches: Dict[int, List[int]] = {pos: [] for pos, _ in active}
+    if not shards:
+        return matches
+    # The OTM and rule pack travel to each worker once, via the initializer.
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(shards)),
+        initializer=_init_worker,
+        initargs=(otm, rules),
+    ) as pool:
+        for part, part_stats in pool.map(_run_shard, shards):
+            for pos, rows in part.items():
+                matches[pos].extend(rows)
+            if stats is not None and part_stats:
+                for pos, s in part_stats.items():
+                    stats.setdefault(pos, RuleStats()).merge(s)
+    return matches
+
+
+def _init_many_worker(rules: List[Rule]) -> None:
+    _WORKER["rules"] = rules
+
+
+def _evaluate_model(
+    model_id: str, otm: OTM | dict[str, Any], compact: bool = False
+) -> Tuple[str, EvaluationResult | CompactResult]:
+    if not isinstance(otm, OTM):
+        otm = OTM.model_validate(otm)
+    return model_id, evaluate(otm, _WORKER["rules"], compact=compact)
+
+
+def evaluate_many_parallel(
+    models: Iterable[Tuple[str, OTM | dict[str, Any]]],
+    rules: List[Rule],
+    workers: int,
+    *,
+    compact: bool = False,
+) -> Iterator[Tuple[str, EvaluationResult | CompactResult]]:
+    # Keep at most two models per worker queued so the input iterable is
+    # consumed lazily.
+    window = workers * 2
+    pending: Set[Future] = set()
+    source = iter(models)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_many_worker, initargs=(rules,)) as pool:
+        for model_id, otm in source:
+            pending.add(pool.submit(_evaluate_model, model_id, otm, compact))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
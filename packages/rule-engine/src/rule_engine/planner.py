@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import jmespath
+from jmespath.visitor import TreeInterpreter
+
+from .expr import compile_where
+from .model import Rule
+
+# Nodes that are cheaper to evaluate than to look up, or that do not yield plain values.
+_NOT_SHARED = frozenset({"field", "literal", "current", "identity", "expref", "raw_string"})
+
+
+def _node_key(node: dict[str, Any], keys: Dict[int, Hashable], counts: Dict[Hashable, int]) -> Hashable:
+    """Structural key of an AST node; records keys and occurrence counts of subtrees."""
+    value = node.get("value")
+    if not isinstance(value, (str, int, float, bool, type(None))):
+        value = json.dumps(value, sort_keys=True)
+    key = (node["type"], value, tuple(_node_key(c, keys, counts) for c in node.get("children", [])))
+    if node["type"] not in _NOT_SHARED:
+        keys[id(node)] = key
+        counts[key] = counts.get(key, 0) + 1
+    return key
+
+
+class SharedSubexpressionInterpreter(TreeInterpreter):
+    """TreeInterpreter that memoizes selected subtrees while evaluating one entity.
+
+    Only visits against the entity's root scope are memoized, since the value
+    of a subtree inside a projection or filter depends on the current element.
+    """
+
+    def __init__(self, options: jmespath.Options | None, shared: Dict[int, Hashable]) -> None:
+        super().__init__(options)
+        self._shared = shared
+        self._root: Any = None
+        self._memo: Dict[Hashable, Any] = {}
+        self.hits = 0
+
+    def start(self, root: Any) -> None:
+        self._root = root
+        self._memo.clear()
+
+    def visit(self, node: dict[str, Any], *args: Any, **kwargs: Any) -> Any:
+        key = self._shared.get(id(node))
+        if key is None or not args or args[0] is not self._root:
+            return super().visit(node, *args, **kwargs)
+        if key in self._memo:
+            self.hits += 1
+            return self._memo[key]
+        result = self._memo[key] = super().visit(node, *args, **kwargs)
+        return result
+
+
+class PackPlan:
+    """Per-entity evaluation plan for the rules of one select group.
+
+    Subexpressions that occur more than once across the group's `where`
+    ASTs are evaluated at most once per entity and reused by later rules.
+    """
+
+    def __init__(self, group: List[Tuple[int, Rule]], options: jmespath.Options | None = None) -> None:
+        self.rules: List[Tuple[int, Rule, Optional[dict[str, Any]]]] = [
+            (pos, rule, compile_where(rule.where).parsed if rule.where else None) for pos, rule in group
+        ]
+        keys: Dict[int, Hashable] = {}
+        counts: Dict[Hashable, int] = {}
+        for _, _, parsed in self.rules:
+            if parsed is not None:
+                _node_key(parsed, keys, counts)
+        self.shared = {node_id: key for node_id, key in keys.items() if counts[key] > 1}
+        self.interpreter = SharedSubexpressionInterpreter(options, self.shared)
+
+    def start(self, scope: dict[str, Any]) -> None:
+        """Begin a new entity; previously memoized results are dropped."""
+        self.interpreter.start(scope)
+
+    def search(self, parsed: Optional[dict[str, Any]], scope: dict[str, Any]) -> Any:
+        if parsed is None:
+            return True
+        return self.interpreter.visit(parsed, scope)
+
+    def matches(self, parsed: Optional[dict[str, Any]], scope: dict[str, Any]) -> bool:
+        try:
+            return bool(self.search(parsed, scope))
+        except Exception:
+            return False
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from .model import Rule, RuleProfile
+
+
+class RuleStats:
+    """Mutable per-rule counters filled in while a profiled evaluation runs."""
+
+    __slots__ = ("seconds", "candidates", "matches", "errors", "format_seconds", "vectorized")
+
+    def __init__(self) -> None:
+        self.seconds = 0.0
+        self.candidates = 0
+        self.matches = 0
+        self.errors = 0
+        self.format_seconds = 0.0
+        self.vectorized = False
+
+    def merge(self, other: "RuleStats") -> None:
+        self.seconds += other.seconds
+        self.candidates += other.candidates
+        self.matches += other.matches
+        self.errors += other.errors
+        self.format_seconds += other.format_seconds
+        self.vectorized = self.vectorized or other.vectorized
+
+    def to_profile(self, rule: Rule) -> RuleProfile:
+        return RuleProfile(
+            ruleId=rule.id,
+            select=rule.select,
+            seconds=self.seconds,
+            candidates=self.candidates,
+            matches=self.matches,
+            errors=self.errors,
+            formatSeconds=self.format_seconds,
+            vectorized=self.vectorized,
+        )
@@ -1,87 +1,351 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List
-
-from pydantic import BaseModel
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Sequence, Tuple, overload
 
 from otm_model.types import OTM
-from .model import Rule, Finding, EvaluationResult
-from .expr import evaluate_where, build_context
+from .model import SEVERITY_RANK, Rule, Finding, EvaluationResult, RuleProfile
+from .columns import EntityColumns, iter_mask
+from .compact import CompactFinding, CompactResult
+from .expr import (
+    ExprContext,
+    build_rule_context,  # noqa: F401  (re-exported)
+    build_scope,
+    classify_where,
+    compile_where,
+)
+from .message import compile_message
+from .index import OtmIndex, index_otm  # noqa: F401  (re-exported)
+from .planner import PackPlan
+from .profiling import RuleStats
+from .snapshot import SELECT_ENTITY_TYPES, EntitySnapshot, selection_key
 
 
-class OtmIndex(BaseModel):
-    id_to_component: Dict[str, Any]
-    id_to_trustzone: Dict[str, Any]
+def load_rules_from_dicts(rule_dicts: Iterable[dict[str, Any]]) -> List[Rule]:
+    return [Rule.model_validate(d) for d in rule_dicts]
 
 
-def index_otm(otm: OTM) -> OtmIndex:
-    return OtmIndex(
-        id_to_component={c.id: c for c in otm.components},
-        id_to_trustzone={z.id: z for z in otm.trustZones},
-    )
+@overload
+def evaluate(
+    otm: OTM,
+    rules: List[Rule],
+    *,
+    workers: int | None = ...,
+    compact: Literal[False] = ...,
+    profile: bool = ...,
+    deadline_ms: float | None = ...,
+    max_findings: int | None = ...,
+) -> EvaluationResult: ...
 
 
-def load_rules_from_dicts(rule_dicts: Iterable[dict[str, Any]]) -> List[Rule]:
-    return [Rule.model_validate(d) for d in rule_dicts]
+@overload
+def evaluate(
+    otm: OTM,
+    rules: List[Rule],
+    *,
+    workers: int | None = ...,
+    compact: Literal[True],
+    profile: bool = ...,
+    deadline_ms: float | None = ...,
+    max_findings: int | None = ...,
+) -> CompactResult: ...
 
 
-def evaluate(otm: OTM, rules: List[Rule]) -> EvaluationResult:
-    idx = index_otm(otm)
-    ctx = build_context(
-        {
-            "cross_trust_zone": lambda obj: _cross_tz(obj, idx),
-            "has_tag": lambda obj, tag: tag in (obj.get("tags") or []),
-        }
-    )
+def evaluate(
+    otm: OTM,
+    rules: List[Rule],
+    *,
+    workers: int | None = None,
+    compact: bool = False,
+    profile: bool = False,
+    deadline_ms: float | None = None,
+    max_findings: int | None = None,
+) -> EvaluationResult | CompactResult:
+    """Evaluate enabled rules against `otm`.
+
+    With `workers` > 1 the (rule, entity) work is sharded across a process
+    pool; findings are identical to, and in the same order as, a serial run.
+    With `compact` the findings reference the evaluated entities instead of
+    copying them; call CompactResult.to_result() where a pydantic model is
+    needed. With `profile` the result carries per-rule timings and counters.
+
+    `deadline_ms` and `max_findings` bound the work: rules are scheduled by
+    severity (critical first) and nothing new is started once the budget is
+    spent. `max_findings` is a hard cap: a rule whose findings would exceed
+    it is not reported. The result is then marked partial and lists the
+    rules not run.
+    """
+    # Findings are bucketed per rule so output order matches rule order even
+    # though entities, not rules, drive the loop.
+    active = [(pos, r) for pos, r in enumerate(rules) if r.enabled and r.select in SELECT_ENTITY_TYPES]
+    snapshot = EntitySnapshot(otm)
+    stats: Dict[int, RuleStats] | None = {pos: RuleStats() for pos, _ in active} if profile else None
+    pending: List[str] = []
+    budgeted = deadline_ms is not None or max_findings is not None
+    if workers is not None and workers > 1:
+        if budgeted:
+            raise ValueError("deadline_ms/max_findings cannot be combined with workers")
+        from .parallel import match_parallel
+
+        matches = match_parallel(otm, snapshot, rules, active, workers, stats)
+    elif budgeted:
+        matches, pending = _match_within_budget(
+            active, snapshot, snapshot.context, stats, deadline_ms, max_findings
+        )
+    else:
+        ctx = snapshot.context
+        matches = {}
+        for select, group in group_rules_by_select(active).items():
+            matches.update(match_group(group, snapshot.entities(select), ctx, stats))
+
+    if compact:
+        compact_findings: List[CompactFinding] = []
+        for pos, rule in active:
+            entities = snapshot.entities(selection_key(rule))
+            entity_type = SELECT_ENTITY_TYPES[rule.select]
+            compact_findings.extend(CompactFinding(rule, entity_type, entities[i]) for i in matches[pos])
+        return CompactResult(compact_findings, summarize(compact_findings), _profiles(active, stats), pending)
 
     findings: List[Finding] = []
+    for pos, rule in active:
+        started = time.perf_counter()
+        entities = snapshot.entities(selection_key(rule))
+        entity_type = SELECT_ENTITY_TYPES[rule.select]
+        findings.extend(_make_finding(rule, entity_type, entities[i]) for i in matches[pos])
+        if stats is not None:
+            stats[pos].format_seconds += time.perf_counter() - started
+    return EvaluationResult(
+        findings=findings,
+        summary=summarize(findings),
+        profile=_profiles(active, stats),
+        partial=bool(pending),
+        pendingRules=pending,
+    )
+
+
+def _severity_rank(rule: Rule) -> int:
+    return SEVERITY_RANK.get(rule.severity, len(SEVERITY_RANK))
+
+
+def _match_within_budget(
+    active: List[Tuple[int, Rule]],
+    snapshot: EntitySnapshot,
+    ctx: ExprContext,
+    stats: Dict[int, RuleStats] | None,
+    deadline_ms: float | None,
+    max_findings: int | None,
+) -> Tuple[Dict[int, List[int]], List[str]]:
+    """Run rules most-severe first until the deadline or findings budget is spent.
+
+    Rules of one severity and select run as a batch; a batch interrupted by
+    the deadline is discarded whole. Results of a batch are kept rule by rule
+    while they fit in `max_findings`; the first rule that does not fit and
+    every later one stay pending. So every rule is either complete or
+    pending, and at most `max_findings` findings are returned.
+    """
+    deadline = time.perf_counter() + deadline_ms / 1000.0 if deadline_ms is not None else None
+    schedule = sorted(active, key=lambda item: (_severity_rank(item[1]), item[0]))
+    tiers: Dict[int, List[Tuple[int, Rule]]] = {}
+    for pos, rule in schedule:
+        tiers.setdefault(_severity_rank(rule), []).append((pos, rule))
+
+    matches: Dict[int, List[int]] = {pos: [] for pos, _ in active}
+    done: set[int] = set()
+    found = 0
+    exhausted = False
+    for tier in tiers.values():
+        for select, group in group_rules_by_select(tier).items():
+            exhausted = (deadline is not None and time.perf_counter() >= deadline) or (
+                max_findings is not None and found >= max_findings
+            )
+            if exhausted:
+                break
+            try:
+                part = match_group(group, snapshot.entities(select), ctx, stats, deadline)
+            except DeadlineExceeded:
+                exhausted = True
+                break
+            for pos, _ in group:
+                rows = part[pos]
+                if max_findings is not None and found + len(rows) > max_findings:
+                    exhausted = True
+                    break
+                matches[pos] = rows
+                done.add(pos)
+                found += len(rows)
+            if exhausted:
+                break
+        if exhausted:
+            break
+    return matches, [rule.id for pos, rule in schedule if pos not in done]
+
+
+def _profiles(active: List[Tuple[int, Rule]], stats: Dict[int, RuleStats] | None) -> List[RuleProfile] | None:
+    if stats is None:
+        return None
+    return [stats[pos].to_profile(rule) for pos, rule in active]
+
+
+def evaluate_many(
+    models: Iterable[Tuple[str, OTM | dict[str, Any]]],
+    rules: List[Rule],
+    *,
+    workers: int | None = None,
+    compact: bool = False,
+) -> Iterator[Tuple[str, EvaluationResult | CompactResult]]:
+    """Evaluate a stream of `(model_id, otm)` pairs against one rule pack.
+
+    Results are yielded as each model finishes; with `workers` > 1 that is
+    completion order, not input order. Only a bounded number of models is in
+    flight at a time, so memory does not grow with the corpus. `compact` is
+    passed on to evaluate().
+    """
     for rule in rules:
-        if not rule.enabled:
-            continue
+        if rule.where:
+            compile_where(rule.where)
+    if workers is not None and workers > 1:
+        from .parallel import evaluate_many_parallel
+
+        yield from evaluate_many_parallel(models, rules, workers, compact=compact)
+        return
+    for model_id, otm in models:
+        if not isinstance(otm, OTM):
+            otm = OTM.model_validate(otm)
+        yield model_id, evaluate(otm, rules, compact=compact)
+
+
+class DeadlineExceeded(Exception):
+    """Raised inside match_group when a budgeted evaluation runs out of time."""
+
+
+# Check the clock every 256 entities in per-entity loops.
+_DEADLINE_STRIDE = 0xFF
+
 
-        candidates: Iterable[dict[str, Any]]
-        entity_type: str
-        if rule.select == "components":
-            candidates = [c.model_dump() for c in otm.components]
-            entity_type = "component"
-        elif rule.select == "dataflows":
-            candidates = [d.model_dump() for d in otm.dataflows]
-            entity_type = "dataflow"
-        elif rule.select == "otm":
-            candidates = [otm.model_dump()]
-            entity_type = "otm"
-        else:
+def _check_deadline(deadline: float | None) -> None:
+    if deadline is not None and time.perf_counter() >= deadline:
+        raise DeadlineExceeded()
+
+
+def match_group(
+    group: List[Tuple[int, Rule]],
+    entities: Sequence[dict[str, Any]],
+    ctx: ExprContext,
+    stats: Dict[int, RuleStats] | None = None,
+    deadline: float | None = None,
+) -> Dict[int, List[int]]:
+    """Run rules sharing one `select` over `entities`; matched row positions keyed by rule position.
+
+    Simple predicates are evaluated column-wise over all entities; the rest
+    fall back to per-entity JMESPath evaluation. Passing `stats` turns on
+    per-rule timing, at some cost. DeadlineExceeded is raised once
+    time.perf_counter() passes `deadline`.
+    """
+    matches: Dict[int, List[int]] = {}
+    columns = EntityColumns(entities)
+    per_entity: List[Tuple[int, Rule]] = []
+    for pos, rule in group:
+        started = time.perf_counter()
+        predicate = classify_where(rule.where) if rule.where else None
+        mask = predicate.mask(columns) if predicate is not None else None
+        if mask is None:
+            per_entity.append((pos, rule))
+            matches[pos] = []
             continue
+        matches[pos] = list(iter_mask(mask))
+        _check_deadline(deadline)
+        if stats is not None:
+            s = stats.setdefault(pos, RuleStats())
+            s.seconds += time.perf_counter() - started
+            s.candidates += len(entities)
+            s.matches += len(matches[pos])
+            s.vectorized = True
+
+    if per_entity and stats is not None:
+        _match_profiled(PackPlan(per_entity, ctx.options), entities, ctx, matches, stats, deadline)
+    elif per_entity:
+        plan = PackPlan(per_entity, ctx.options)
+        for i, obj in enumerate(entities):
+            if deadline is not None and not i & _DEADLINE_STRIDE:
+                _check_deadline(deadline)
+            scope = build_scope(obj, ctx.variables)
+            plan.start(scope)
+            for pos, _, parsed in plan.rules:
+                if plan.matches(parsed, scope):
+                    matches[pos].append(i)
+    return matches
+
 
-        for obj in candidates:
-            if evaluate_where(rule.where, obj, ctx):
-                entity_id = str(obj.get("id", "otm"))
-                findings.append(
-                    Finding(
-                        ruleId=rule.id,
-                        title=rule.title,
-                        severity=rule.severity,
-                        entityType=entity_type,
-                        entityId=entity_id,
-                        message=rule.message.format(**{**obj}),
-                        remediation=rule.remediation,
-                        tags=rule.tags,
-                        evidence=obj,
-                    )
-                )
+def _match_profiled(
+    plan: PackPlan,
+    entities: Sequence[dict[str, Any]],
+    ctx: ExprContext,
+    matches: Dict[int, List[int]],
+    stats: Dict[int, RuleStats],
+    deadline: float | None = None,
+) -> None:
+    # Time spent on a shared subexpression is charged to the first rule that evaluates it.
+    counters = [stats.setdefault(pos, RuleStats()) for pos, _, _ in plan.rules]
+    for i, obj in enumerate(entities):
+        if deadline is not None and not i & _DEADLINE_STRIDE:
+            _check_deadline(deadline)
+        scope = build_scope(obj, ctx.variables)
+        plan.start(scope)
+        for (pos, _, parsed), s in zip(plan.rules, counters):
+            started = time.perf_counter()
+            try:
+                hit = bool(plan.search(parsed, scope))
+            except Exception:
+                hit = False
+                s.errors += 1
+            s.seconds += time.perf_counter() - started
+            if hit:
+                matches[pos].append(i)
+    for (pos, _, _), s in zip(plan.rules, counters):
+        s.candidates += len(entities)
+        s.matches += len(matches[pos])
 
+
+def evaluate_group(
+    group: List[Tuple[int, Rule]],
+    entities: Sequence[dict[str, Any]],
+    entity_type: str,
+    ctx: ExprContext,
+) -> Dict[int, List[Finding]]:
+    """Like match_group, but returns findings keyed by rule position."""
+    rules = dict(group)
+    return {
+        pos: [_make_finding(rules[pos], entity_type, entities[i]) for i in rows]
+        for pos, rows in match_group(group, entities, ctx).items()
+    }
+
+
+def summarize(findings: Iterable[Finding | CompactFinding]) -> Dict[str, int]:
     summary: Dict[str, int] = {}
     for f in findings:
         summary[f.severity] = summary.get(f.severity, 0) + 1
-    return EvaluationResult(findings=findings, summary=summary)
+    return summary
 
 
-def _cross_tz(obj: dict[str, Any], idx: OtmIndex) -> bool:
-    src_tz = obj.get("trustZone") or None
-    if obj.get("entityType") == "dataflow":
-        # Basic inference for dataflow if we have components in index
-        return False
-    if src_tz is None:
-        return False
-    return src_tz not in idx.id_to_trustzone
+def group_rules_by_select(rules: Iterable[Tuple[int, Rule]]) -> Dict[str, List[Tuple[int, Rule]]]:
+    """Group rules by the entity list they run over (select plus `via` filter)."""
+    groups: Dict[str, List[Tuple[int, Rule]]] = {}
+    for pos, rule in rules:
+        groups.setdefault(selection_key(rule), []).append((pos, rule))
+    return groups
 
+
+def _make_finding(rule: Rule, entity_type: str, obj: dict[str, Any]) -> Finding:
+    # Finding is a validated model, so the message is rendered here; callers
+    # that only serialize use CompactFinding, which renders when read.
+    return Finding(
+        ruleId=rule.id,
+        title=rule.title,
+        severity=rule.severity,
+        entityType=entity_type,
+        entityId=str(obj.get("id", "otm")),
+        message=compile_message(rule.message).render(obj),
+        remediation=rule.remediation,
+        tags=rule.tags,
+        evidence=obj,
+    )
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from otm_model.types import OTM, Component, Dataflow, Threat
+from .columns import EntityColumns
+from .coverage import CoverageIndex, index_coverage
+from .expr import ExprContext, build_rule_context, build_scope, classify_where, match_where
+from .graph import DataflowGraph
+
+# select -> entityType reported on findings
+SELECT_ENTITY_TYPES: Dict[str, str] = {
+    "components": "component",
+    "dataflows": "dataflow",
+    "otm": "otm",
+    "neighbors": "component",
+    "component_pairs_reachable": "component_pair",
+    "paths": "path",
+    "uncovered_threats": "threat",
+}
+
+# Selects derived from the dataflow graph; they accept a `via` edge filter.
+GRAPH_SELECTS = frozenset({"neighbors", "component_pairs_reachable", "paths"})
+
+_PAIR_FIELDS = frozenset({"id", "source", "destination"})
+
+# select -> top-level keys of its entity dicts (what a rule message may reference)
+SELECT_FIELDS: Dict[str, frozenset] = {
+    "components": frozenset(Component.model_fields),
+    "dataflows": frozenset(Dataflow.model_fields),
+    "otm": frozenset(OTM.model_fields),
+    "neighbors": frozenset(Component.model_fields)
+    | {"inbound", "outbound", "upstream", "downstream", "reachable"},
+    "component_pairs_reachable": _PAIR_FIELDS,
+    "paths": _PAIR_FIELDS | {"nodes", "dataflows", "hops"},
+    "uncovered_threats": frozenset(Threat.model_fields) | {"mitigations", "uncoveredOn"},
+}
+
+
+def selection_key(rule: Any) -> str:
+    """Key of the entity list a rule runs over: its select, plus its `via` filter if any."""
+    if getattr(rule, "via", None):
+        return f"{rule.select} via {rule.via}"
+    return rule.select
+
+
+class EntitySnapshot:
+    """Per-evaluation view of the selectable OTM collections.
+
+    Each collection is dumped to plain dicts at most once, on first use, and
+    shared by every rule selecting it. Graph selections share one
+    DataflowGraph per `via` filter; coverage queries share one CoverageIndex.
+    """
+
+    def __init__(self, otm: OTM, context: Optional[ExprContext] = None) -> None:
+        self.otm = otm
+        self._context = context
+        self._coverage: Optional[CoverageIndex] = None
+        self._entities: Dict[str, List[dict[str, Any]]] = {}
+        self._graphs: Dict[Optional[str], DataflowGraph] = {}
+
+    @property
+    def coverage(self) -> CoverageIndex:
+        if self._coverage is None:
+            self._coverage = index_coverage(self.otm)
+        return self._coverage
+
+    @property
+    def context(self) -> ExprContext:
+        if self._context is None:
+            self._context = build_rule_context(self.otm, self.coverage)
+        return self._context
+
+    def entities(self, select: str) -> List[dict[str, Any]]:
+        cached = self._entities.get(select)
+        if cached is None:
+            cached = self._materialize(select)
+            self._entities[select] = cached
+        return cached
+
+    def count(self, select: str) -> int:
+        """Number of entities for `select`, without materializing collections."""
+        if select == "components":
+            return len(self.otm.components)
+        if select == "dataflows":
+            return len(self.otm.dataflows)
+        if select == "otm":
+            return 1
+        # derived selections (graph, coverage) are sized by materializing them
+        return len(self.entities(select))
+
+    def graph(self, via: Optional[str] = None) -> DataflowGraph:
+        """Dataflow graph over components, keeping only dataflows matching `via`."""
+        cached = self._graphs.get(via)
+        if cached is None:
+            flows = self.entities("dataflows")
+            cached = DataflowGraph.build(
+                [c.id for c in self.otm.components],
+                [(d.source, d.destination) for d in self.otm.dataflows],
+                self._edge_filter(via, flows) if via else None,
+            )
+            self._graphs[via] = cached
+        return cached
+
+    def _edge_filter(self, via: str, flows: List[dict[str, Any]]) -> List[bool]:
+        predicate = classify_where(via)
+        mask = predicate.mask(EntityColumns(flows)) if predicate is not None else None
+        if mask is not None:
+            return [bool(mask >> i & 1) for i in range(len(flows))]
+        ctx = self.context
+        return [match_where(via, build_scope(d, ctx.variables), ctx.options) for d in flows]
+
+    def _materialize(self, select: str) -> List[dict[str, Any]]:
+        if select == "components":
+            return [c.model_dump() for c in self.otm.components]
+        if select == "dataflows":
+            return [d.model_dump() for d in self.otm.dataflows]
+        if select == "otm":
+            return [self.otm.model_dump()]
+        if select == "uncovered_threats":
+            return self.coverage.uncovered_threats(self.otm)
+        base, _, via = select.partition(" via ")
+        if base == "neighbors":
+            return self._neighbors(self.graph(via or None))
+        if base == "component_pairs_reachable":
+            return self._pairs(self.graph(via or None), with_paths=False)
+        if base == "paths":
+            return self._pairs(self.graph(via or None), with_paths=True)
+        raise KeyError(f"Unknown select: {select}")
+
+    def _neighbors(self, graph: DataflowGraph) -> List[dict[str, Any]]:
+        components = self.entities("components")
+        flows = self.entities("dataflows")
+        ids = graph.component_ids
+        out = []
+        for v, comp in enumerate(components):
+            out.append(
+                {
+                    **comp,
+                    "inbound": [flows[f] for _, f in graph.in_edges[v]],
+                    "outbound": [flows[f] for _, f in graph.out_edges[v]],
+                    "upstream": sorted({ids[u] for u, _ in graph.in_edges[v]}),
+                    "downstream": sorted({ids[w] for w, _ in graph.out_edges[v]}),
+                    "reachable": [ids[w] for w in graph.reachable_from(v)],
+                }
+            )
+        return out
+
+    def _pairs(self, graph: DataflowGraph, with_paths: bool) -> List[dict[str, Any]]:
+        components = self.entities("components")
+        flows = self.entities("dataflows")
+        ids = graph.component_ids
+        out = []
+        for v in range(len(graph)):
+            targets = graph.reachable_from(v)
+            if not targets:
+                continue
+            paths = graph.shortest_paths_from(v) if with_paths else None
+            for w in targets:
+                pair: dict[str, Any] = {
+                    "id": f"{ids[v]}->{ids[w]}",
+                    "source": components[v],
+                    "destination": components[w],
+                }
+                if paths is not None:
+                    nodes, hops = paths[w]
+                    pair["nodes"] = [ids[n] for n in nodes]
+                    pair["dataflows"] = [flows[f] for f in hops]
+                    pair["hops"] = len(hops)
+                out.append(pair)
+        return out
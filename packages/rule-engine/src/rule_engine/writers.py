@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+from .compact import CompactFinding
+from .merge import fingerprint
+from .model import Finding, Rule
+
+FindingLike = Union[Finding, CompactFinding]
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+TOOL_NAME = "threatflow-rules"
+
+# Finding severity -> SARIF result level
+SARIF_LEVELS: Dict[str, str] = {
+    "critical": "error",
+    "high": "error",
+    "medium": "warning",
+    "low": "note",
+    "info": "note",
+}
+
+
+def finding_dict(f: FindingLike) -> Dict[str, Any]:
+    return f.to_dict() if isinstance(f, CompactFinding) else f.model_dump()
+
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def ndjson_line(f: FindingLike, **extra: Any) -> str:
+    """One finding as an NDJSON line; `extra` keys (e.g. model) come first."""
+    return _dumps({**extra, **finding_dict(f)}) + "\n"
+
+
+def _partial(pending_rules: Optional[List[str]]) -> Dict[str, Any]:
+    # same keys as EvaluationResult; only present when the budget cut the run short
+    return {"partial": True, "pendingRules": list(pending_rules)} if pending_rules else {}
+
+
+def iter_ndjson(
+    findings: Iterable[FindingLike],
+    summary: Optional[Dict[str, int]] = None,
+    pending_rules: Optional[List[str]] = None,
+) -> Iterator[str]:
+    """One JSON line per finding, then a final `{"summary": ...}` line.
+
+    Findings are serialized one at a time; `summary` (if given) is filled in
+    as they go, so the counters are known once the stream is exhausted. When
+    `pending_rules` is non-empty the last line also carries `"partial": true`
+    and `pendingRules`.
+    """
+    counts: Dict[str, int] = {} if summary is None else summary
+    for f in findings:
+        counts[f.severity] = counts.get(f.severity, 0) + 1
+        yield ndjson_line(f)
+    yield _dumps({"summary": counts, **_partial(pending_rules)}) + "\n"
+
+
+def write_ndjson(
+    findings: Iterable[FindingLike], out: TextIO, pending_rules: Optional[List[str]] = None
+) -> Dict[str, int]:
+    summary: Dict[str, int] = {}
+    for line in iter_ndjson(findings, summary, pending_rules):
+        out.write(line)
+    return summary
+
+
+def _sarif_rule(rule: Rule) -> Dict[str, Any]:
+    out: Dict[str, Any] = {
+        "id": rule.id,
+        "name": rule.title,
+        "shortDescription": {"text": rule.title},
+        "defaultConfiguration": {"level": SARIF_LEVELS.get(rule.severity, "warning")},
+        "properties": {"severity": rule.severity, "tags": list(rule.tags)},
+    }
+    if rule.description:
+        out["fullDescription"] = {"text": rule.description}
+    if rule.remediation:
+        out["help"] = {"text": rule.remediation}
+    return out
+
+
+def _sarif_result(f: FindingLike) -> Dict[str, Any]:
+    return {
+        "ruleId": f.ruleId,
+        "level": SARIF_LEVELS.get(f.severity, "warning"),
+        "message": {"text": f.message},
+        "locations": [{"logicalLocations": [{"name": f.entityId, "kind": f.entityType}]}],
+        "partialFingerprints": {"threatflow/v2": fingerprint(f)},
+        "properties": {"severity": f.severity, "tags": list(f.tags)},
+    }
+
+
+def iter_sarif(
+    findings: Iterable[FindingLike],
+    rules: Optional[Iterable[Rule]] = None,
+    summary: Optional[Dict[str, int]] = None,
+    pending_rules: Optional[List[str]] = None,
+) -> Iterator[str]:
+    """Serialize findings as one SARIF 2.1.0 log, a chunk per result.
+
+    Results are written before the tool section, so rule descriptors for
+    findings without a Rule (e.g. merged external findings) are collected
+    while streaming. The severity summary goes into the run's properties;
+    a partial run (non-empty `pending_rules`) also gets an invocation with
+    executionSuccessful false.
+    """
+    counts: Dict[str, int] = {} if summary is None else summary
+    descriptors: Dict[str, Dict[str, Any]] = {r.id: _sarif_rule(r) for r in rules or ()}
+    yield '{"$schema": %s, "version": %s, "runs": [{"results": [' % (_dumps(SARIF_SCHEMA), _dumps(SARIF_VERSION))
+    sep = ""
+    for f in findings:
+        counts[f.severity] = counts.get(f.severity, 0) + 1
+        if f.ruleId not in descriptors:
+            descriptors[f.ruleId] = (
+                _sarif_rule(f.rule)
+                if isinstance(f, CompactFinding)
+                else {"id": f.ruleId, "name": f.title, "shortDescription": {"text": f.title}}
+            )
+        yield sep + _dumps(_sarif_result(f))
+        sep = ", "
+    driver = {"name": TOOL_NAME, "rules": list(descriptors.values())}
+    tail = ""
+    if pending_rules:
+        invocation = {
+            "executionSuccessful": False,
+            "toolExecutionNotifications": [
+                {"level": "warning", "message": {"text": "evaluation budget exhausted; rules not run: " + ", ".join(pending_rules)}}
+            ],
+        }
+        tail = ', "invocations": %s' % _dumps([invocation])
+    properties = {"summary": counts, **_partial(pending_rules)}
+    yield '], "tool": %s%s, "properties": %s}]}\n' % (_dumps({"driver": driver}), tail, _dumps(properties))
+
+
+def write_sarif(
+    findings: Iterable[FindingLike],
+    out: TextIO,
+    rules: Optional[List[Rule]] = None,
+    pending_rules: Optional[List[str]] = None,
+) -> Dict[str, int]:
+    summary: Dict[str, int] = {}
+    for chunk in iter_sarif(findings, rules, summary, pending_rules):
+        out.write(chunk)
+    return summary
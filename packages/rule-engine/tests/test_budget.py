@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from rule_engine import evaluate, load_rules_from_dicts
+from otm_model.types import OTM, Component
+
+
+def sample_otm() -> OTM:
+    return OTM(
+        otmVersion="0.1",
+        name="S",
+        components=[Component(id=f"c{i}", name=f"C{i}", type="process") for i in range(5)],
+    )
+
+
+RULES = load_rules_from_dicts(
+    {"id": rid, "title": rid, "severity": sev, "select": "components", "where": "type == 'process'", "message": "{id}"}
+    for rid, sev in [("R-LOW", "low"), ("R-CRIT", "critical"), ("R-HIGH", "high")]
+)
+
+
+def test_unbudgeted_result_is_complete() -> None:
+    res = evaluate(sample_otm(), RULES)
+    assert not res.partial and res.pendingRules == []
+
+
+def test_max_findings_runs_most_severe_first() -> None:
+    res = evaluate(sample_otm(), RULES, max_findings=5)
+    assert res.partial
+    assert {f.ruleId for f in res.findings} == {"R-CRIT"}
+    assert res.pendingRules == ["R-HIGH", "R-LOW"]
+
+
+def test_expired_deadline_runs_nothing() -> None:
+    res = evaluate(sample_otm(), RULES, deadline_ms=0)
+    assert res.partial and res.findings == []
+    assert res.pendingRules == ["R-CRIT", "R-HIGH", "R-LOW"]
+
+
+def test_max_findings_is_a_cap_within_a_batch() -> None:
+    # both critical rules run as one batch of 5 + 5 findings
+    rules = load_rules_from_dicts(
+        {"id": rid, "title": rid, "severity": "critical", "select": "components", "where": "type == 'process'",
+         "message": "{id}"}
+        for rid in ("R-A", "R-B")
+    )
+    res = evaluate(sample_otm(), rules, max_findings=7)
+    assert [f.ruleId for f in res.findings] == ["R-A"] * 5
+    assert res.partial and res.pendingRules == ["R-B"]
+    res = evaluate(sample_otm(), rules, max_findings=1)
+    assert res.findings == [] and res.pendingRules == ["R-A", "R-B"]
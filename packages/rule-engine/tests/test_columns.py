@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import pytest
+
+from rule_engine.columns import EntityColumns, iter_mask
+from rule_engine.expr import build_scope, classify_where, match_where
+
+ENTITIES = [
+    {"id": "f1", "protocol": "http", "tags": ["ext"]},
+    {"id": "f2", "protocol": "https", "tags": []},
+    {"id": "f3", "protocol": "mqtt", "tags": ["ext", "pci"]},
+    {"id": "f4", "protocol": "tcp", "tags": ["pci"]},
+]
+
+# nulls, missing fields and mixed types, on which some tests raise
+MIXED = [
+    {"id": "f1", "protocol": "https", "port": 1, "tls": True},
+    {"id": "f2", "protocol": None, "port": 0, "tls": False},
+    {"id": "f3", "protocol": "http", "port": True, "tls": 1, "tags": ["x"]},
+    {"id": "f4", "protocol": "https", "port": 0.0, "tls": 0, "tags": None},
+]
+
+
+@pytest.mark.parametrize(
+    "where",
+    [
+        "contains(`['http','tcp']`, protocol)",
+        "protocol == 'https'",
+        "protocol != 'https'",
+        "contains(tags, 'ext')",
+        "!contains(tags, 'pci') && protocol != 'tcp'",
+        "protocol == 'tcp' || contains(tags, 'pci')",
+    ],
+)
+def test_column_mask_matches_per_entity(where: str) -> None:
+    predicate = classify_where(where)
+    assert predicate is not None
+    mask = predicate.mask(EntityColumns(ENTITIES))
+    expected = [i for i, e in enumerate(ENTITIES) if match_where(where, build_scope(e, {}))]
+    assert mask is not None and list(iter_mask(mask)) == expected
+
+
+def _column_path(where: str, entities: list) -> list:
+    predicate = classify_where(where)
+    mask = predicate.mask(EntityColumns(entities)) if predicate is not None else None
+    if mask is None:
+        return [i for i, e in enumerate(entities) if match_where(where, build_scope(e, {}))]
+    return list(iter_mask(mask))
+
+
+@pytest.mark.parametrize(
+    "where",
+    [
+        "!starts_with(protocol, 'https')",
+        "starts_with(protocol, 'https')",
+        "!contains(tags, 'x')",
+        "contains(tags, 'x') || protocol == 'https'",
+        "port == `1`",
+        "port == `0`",
+        "tls == `true` && !(port == `0`)",
+        "!tls",
+        "tls",
+        "!port",
+        "tls || port == `0`",
+    ],
+)
+def test_column_path_agrees_with_match_where(where: str) -> None:
+    expected = [i for i, e in enumerate(MIXED) if match_where(where, build_scope(e, {}))]
+    assert _column_path(where, MIXED) == expected
+
+
+def test_complex_expressions_are_not_classified() -> None:
+    assert classify_where("protocol == type") is None
+    assert classify_where("obj.protocol == 'http'") is None
+    assert classify_where("length(tags[?@ == 'x']) > `0`") is None
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from rule_engine import CompactResult, evaluate, load_rules_from_dicts
+from otm_model.types import OTM, Component, Dataflow
+
+
+def test_compact_result_converts_to_pydantic_result() -> None:
+    otm = OTM(
+        otmVersion="0.1",
+        name="S",
+        components=[Component(id="a", name="A", type="process"), Component(id="b", name="B", type="store")],
+        dataflows=[Dataflow(id="f1", source="a", destination="b", protocol="http")],
+    )
+    rules = load_rules_from_dicts(
+        [
+            {"id": "R-1", "title": "plain", "severity": "high", "select": "dataflows",
+             "where": "protocol == 'http'", "message": "flow {id} uses {protocol}"},
+            {"id": "R-2", "title": "all", "severity": "low", "select": "components", "message": "{name}"},
+        ]
+    )
+    compact = evaluate(otm, rules, compact=True)
+    assert isinstance(compact, CompactResult)
+    assert compact.summary == {"high": 1, "low": 2}
+    assert compact.findings[0].message == "flow f1 uses http"
+    assert compact.to_result() == evaluate(otm, rules)
+    assert compact.to_dict() == evaluate(otm, rules).model_dump()
+    profiled = evaluate(otm, rules, compact=True, profile=True)
+    assert profiled.to_dict() == profiled.to_result().model_dump()
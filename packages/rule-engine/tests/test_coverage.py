@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from rule_engine import evaluate, load_rules_from_dicts
+from rule_engine.coverage import index_coverage
+from rule_engine.incremental import ChangeSet, IncrementalEvaluator
+from otm_model.types import OTM, Component, Mitigation, Threat
+
+
+def sample_otm() -> OTM:
+    return OTM(
+        otmVersion="0.1",
+        name="C",
+        components=[Component(id="a", name="A", type="process"), Component(id="b", name="B", type="store")],
+        threats=[
+            Threat(id="t1", name="Spoofing", appliesTo=["a", "b"]),
+            Threat(id="t2", name="Tampering", appliesTo=["b"]),
+            Threat(id="t3", name="Repudiation", appliesTo=["a"]),
+        ],
+        mitigations=[
+            Mitigation(id="m1", name="Auth", appliesTo=["t1"]),
+            Mitigation(id="m2", name="Signing", appliesTo=["t2", "c"]),
+        ],
+    )
+
+
+def test_coverage_index() -> None:
+    cov = index_coverage(sample_otm())
+    assert cov.threats_of("b") == ["t1", "t2"]
+    # m1 covers t1 everywhere; m2 covers t2 only on "c"
+    assert cov.uncovered_threats_of("b") == ["t2"]
+    assert cov.mitigations_of("t2") == ["m2"]
+
+
+def test_coverage_functions_and_select() -> None:
+    rules = load_rules_from_dicts(
+        [
+            {"id": "U", "title": "unmitigated", "severity": "medium", "select": "uncovered_threats",
+             "message": "{name} on {uncoveredOn}"},
+            {"id": "C", "title": "exposed", "severity": "high", "select": "components",
+             "where": "length(uncovered_threats_of(id)) > `0` && type == 'process'", "message": "{id}"},
+        ]
+    )
+    res = evaluate(sample_otm(), rules)
+    assert [(f.ruleId, f.entityId) for f in res.findings] == [("U", "t2"), ("U", "t3"), ("C", "a")]
+    assert res.findings[0].message == "Tampering on ['b']"
+
+
+def test_mitigation_change_updates_incrementally() -> None:
+    rules = load_rules_from_dicts(
+        [{"id": "C", "title": "exposed", "severity": "high", "select": "components",
+          "where": "length(uncovered_threats_of(id)) > `0`", "message": "{id}"}]
+    )
+    otm = sample_otm()
+    inc = IncrementalEvaluator(rules)
+    assert [f.entityId for f in inc.evaluate(otm).findings] == ["a", "b"]
+    otm.mitigations.append(Mitigation(id="m3", name="Audit", appliesTo=["t3"]))
+    res = inc.update(otm, ChangeSet(added={"m3"}))
+    assert [f.entityId for f in res.findings] == [f.entityId for f in evaluate(otm, rules).findings] == ["b"]
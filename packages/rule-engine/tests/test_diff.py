@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from rule_engine import diff_results, evaluate, load_rules_from_dicts
+from rule_engine.diff import diff_otm, evaluate_diff
+from rule_engine.model import Finding
+from otm_model.types import OTM, Component, Dataflow, TrustZone
+
+RULES = [
+    {"id": "DF", "title": "plain", "severity": "high", "select": "dataflows",
+     "where": "protocol == 'http'", "message": "{id}"},
+    {"id": "ST", "title": "store", "severity": "low", "select": "components",
+     "where": "type == 'store'", "message": "{id}"},
+    {"id": "O", "title": "big", "severity": "info", "select": "otm",
+     "where": "length(dataflows) > `1`", "message": "{name}"},
+]
+
+
+def base_otm() -> OTM:
+    return OTM(
+        otmVersion="0.1",
+        name="D",
+        trustZones=[TrustZone(id="z", name="Z")],
+        components=[Component(id="a", name="A", type="process"), Component(id="b", name="B", type="store")],
+        dataflows=[Dataflow(id="f1", source="a", destination="b", protocol="http")],
+    )
+
+
+def head_otm() -> OTM:
+    head = base_otm().model_copy(deep=True)
+    head.dataflows[0].protocol = "tls"
+    head.dataflows.append(Dataflow(id="f2", source="b", destination="a", protocol="http"))
+    return head
+
+
+def test_diff_results_by_fingerprint() -> None:
+    rules = load_rules_from_dicts(RULES)
+    diff = diff_results(evaluate(base_otm(), rules), evaluate(head_otm(), rules, compact=True))
+    assert [f.entityId for f in diff.new] == ["f2", "otm"]
+    assert [f.entityId for f in diff.fixed] == ["f1"]
+    assert [f.entityId for f in diff.unchanged] == ["b"]
+    assert diff.counts() == {"new": 2, "fixed": 1, "unchanged": 1}
+
+
+def test_diff_otm_and_incremental_diff_agree() -> None:
+    changes = diff_otm(base_otm(), head_otm())
+    assert (changes.added, changes.removed, changes.modified) == ({"f2"}, set(), {"f1"})
+    rules = load_rules_from_dicts(RULES)
+    full = diff_results(evaluate(base_otm(), rules), evaluate(head_otm(), rules))
+    assert evaluate_diff(base_otm(), head_otm(), rules) == full
+
+
+def test_diff_results_keeps_rules_sharing_a_title_apart() -> None:
+    def finding(rule_id: str) -> Finding:
+        return Finding(ruleId=rule_id, title="same", severity="low", entityType="component", entityId="a", message="m")
+
+    diff = diff_results([finding("R1")], [finding("R1"), finding("R2"), finding("R2")])
+    assert diff.counts() == {"new": 2, "fixed": 0, "unchanged": 1}
+    assert [f.ruleId for f in diff.new] == ["R2", "R2"]
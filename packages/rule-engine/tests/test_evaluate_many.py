@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from rule_engine import evaluate_many
+from rule_engine.cli import main
+from rule_engine.loader import load_rules_from_yaml_dir
+
+RULES_DIR = Path(__file__).resolve().parents[1] / "rules" / "builtin"
+
+
+def otm_doc(name: str, protocol: str) -> dict:
+    return {
+        "otmVersion": "0.1",
+        "name": name,
+        "components": [{"id": "a", "name": "A", "type": "process"}, {"id": "b", "name": "B", "type": "store"}],
+        "dataflows": [{"id": "f1", "source": "a", "destination": "b", "protocol": protocol}],
+    }
+
+
+def test_evaluate_many_streams_per_model() -> None:
+    rules = load_rules_from_yaml_dir(RULES_DIR)
+    models = [("m1", otm_doc("m1", "http")), ("m2", otm_doc("m2", "https")), ("m3", otm_doc("m3", "tcp"))]
+    serial = dict(evaluate_many(iter(models), rules))
+    assert {k: len(v.findings) for k, v in serial.items()} == {"m1": 1, "m2": 0, "m3": 1}
+    assert dict(evaluate_many(iter(models), rules, workers=2)) == serial
+
+
+def test_cli_writes_ndjson(tmp_path: Path) -> None:
+    (tmp_path / "a.json").write_text(json.dumps(otm_doc("a", "http")), encoding="utf-8")
+    (tmp_path / "b.json").write_text(json.dumps(otm_doc("b", "https")), encoding="utf-8")
+    out = tmp_path / "findings.ndjson"
+    assert main([str(tmp_path), "--rules", str(RULES_DIR), "-o", str(out)]) == 0
+    lines = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [(r["model"].endswith("a.json"), r["ruleId"]) for r in lines] == [(True, "DF-TLS-001")]
+
+
+def test_cli_reports_bad_models_and_keeps_going(tmp_path: Path) -> None:
+    (tmp_path / "a.json").write_text("{not json", encoding="utf-8")
+    (tmp_path / "b.json").write_text(json.dumps({"name": "pkg"}), encoding="utf-8")
+    (tmp_path / "c.json").write_text(json.dumps(otm_doc("c", "http")), encoding="utf-8")
+    out = tmp_path / "findings.ndjson"
+    assert main([str(tmp_path), "--rules", str(RULES_DIR), "-o", str(out)]) == 1
+    lines = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [Path(r["model"]).name for r in lines] == ["a.json", "b.json", "c.json"]
+    assert "error" in lines[0] and "error" in lines[1]
+    assert lines[2]["ruleId"] == "DF-TLS-001"
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from rule_engine import load_rules_from_dicts
+from rule_engine.expr import compile_where, evaluate_where
+
+
+def _rule(where: str) -> dict:
+    return {
+        "id": "R-1",
+        "title": "t",
+        "severity": "low",
+        "select": "dataflows",
+        "where": where,
+        "message": "{id}",
+    }
+
+
+def test_invalid_where_fails_at_load_time() -> None:
+    with pytest.raises(ValidationError):
+        load_rules_from_dicts([_rule("protocol == ")])
+
+
+def test_compiled_where_is_cached_by_text() -> None:
+    where = "protocol == 'ftp'"
+    assert compile_where(where) is compile_where(where)
+    assert evaluate_where(where, {"protocol": "ftp"}, {})
+    assert not evaluate_where(where, {"protocol": "https"}, {})
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from rule_engine import evaluate, load_rules_from_dicts
+from rule_engine.expr import RuleFunctions, evaluate_where
+from rule_engine.index import index_otm
+from otm_model.types import OTM, Component, Dataflow, TrustZone
+
+import jmespath
+
+
+def sample_otm() -> OTM:
+    return OTM(
+        otmVersion="0.1",
+        name="S",
+        trustZones=[TrustZone(id="public", name="Public"), TrustZone(id="private", name="Private")],
+        components=[
+            Component(id="a", name="A", type="process", trustZone="public", tags=["internet"]),
+            Component(id="b", name="B", type="store", trustZone="private"),
+            Component(id="c", name="C", type="process", trustZone="private"),
+        ],
+        dataflows=[
+            Dataflow(id="f1", source="a", destination="b", protocol="http"),
+            Dataflow(id="f2", source="b", destination="c", protocol="http"),
+        ],
+    )
+
+
+def test_cross_trust_zone_is_a_jmespath_function() -> None:
+    rules = load_rules_from_dicts(
+        [
+            {"id": "X-DF", "title": "cross", "severity": "high", "select": "dataflows",
+             "where": "protocol == 'http' && cross_trust_zone(@)", "message": "{id}"},
+            {"id": "X-C", "title": "edge", "severity": "low", "select": "components",
+             "where": "cross_trust_zone(@) && has_tag(@, 'internet')", "message": "{id}"},
+        ]
+    )
+    res = evaluate(sample_otm(), rules)
+    assert [(f.ruleId, f.entityId) for f in res.findings] == [("X-DF", "f1"), ("X-C", "a")]
+
+
+def test_trust_zone_lookup() -> None:
+    options = jmespath.Options(custom_functions=RuleFunctions(index_otm(sample_otm())))
+    obj = {"id": "f2", "source": "b", "destination": "c"}
+    assert evaluate_where("trust_zone(source) == trust_zone(destination)", obj, {}, options)
+
+
+def test_index_is_shared_until_the_model_changes() -> None:
+    otm = sample_otm()
+    first = index_otm(otm)
+    assert index_otm(otm) is first
+    assert first.cross_zone_components == {"a", "b"}
+    otm.components[0].trustZone = "private"
+    second = index_otm(otm)
+    assert second is not first and not second.cross_zone_components
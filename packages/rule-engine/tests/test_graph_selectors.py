@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from rule_engine import evaluate, load_rules_from_dicts
+from rule_engine.graph import DataflowGraph
+from rule_engine.incremental import ChangeSet, IncrementalEvaluator
+from otm_model.types import OTM, Component, Dataflow
+
+
+def sample_otm() -> OTM:
+    # web -> api -> db over plain http; web -> cache -> db only over tls
+    return OTM(
+        otmVersion="0.1",
+        name="G",
+        components=[
+            Component(id="web", name="Web", type="actor", tags=["public"]),
+            Component(id="api", name="API", type="process"),
+            Component(id="db", name="DB", type="store"),
+            Component(id="cache", name="Cache", type="store"),
+        ],
+        dataflows=[
+            Dataflow(id="f1", source="web", destination="api", protocol="http"),
+            Dataflow(id="f2", source="api", destination="db", protocol="tls"),
+            Dataflow(id="f3", source="web", destination="cache", protocol="http"),
+            Dataflow(id="f4", source="cache", destination="db", protocol="http"),
+        ],
+    )
+
+
+def test_closure_handles_cycles() -> None:
+    g = DataflowGraph.build(["a", "b", "c", "d"], [("a", "b"), ("b", "c"), ("c", "b"), ("c", "d")])
+    assert [g.reachable_from(v) for v in range(4)] == [[1, 2, 3], [2, 3], [1, 3], []]
+    assert g.closure()[1] >> 1 & 1  # b is on a cycle
+    assert g.shortest_paths_from(0)[3] == ([0, 1, 2, 3], [0, 1, 3])
+
+
+def test_public_actor_reaches_store_without_tls() -> None:
+    rules = load_rules_from_dicts(
+        [
+            {"id": "G-1", "title": "plaintext path", "severity": "high",
+             "select": "component_pairs_reachable", "via": "protocol != 'tls'",
+             "where": "contains(source.tags, 'public') && destination.type == 'store'",
+             "message": "{source[name]} reaches {destination[name]}"},
+        ]
+    )
+    res = evaluate(sample_otm(), rules)
+    assert [(f.entityType, f.entityId) for f in res.findings] == [
+        ("component_pair", "web->db"),
+        ("component_pair", "web->cache"),
+    ]
+    assert res.findings[0].message == "Web reaches DB"
+
+
+def test_paths_and_neighbors() -> None:
+    rules = load_rules_from_dicts(
+        [
+            {"id": "P", "title": "long", "severity": "low", "select": "paths",
+             "where": "hops > `1` && destination.id == 'db'", "message": "{nodes}"},
+            {"id": "N", "title": "fan-out", "severity": "low", "select": "neighbors",
+             "where": "length(downstream) > `1`", "message": "{id}"},
+        ]
+    )
+    res = evaluate(sample_otm(), rules)
+    assert [(f.ruleId, f.entityId) for f in res.findings] == [("P", "web->db"), ("N", "web")]
+    assert res.findings[0].evidence["nodes"] == ["web", "api", "db"]
+
+
+def test_graph_rules_match_after_incremental_update() -> None:
+    rules = load_rules_from_dicts(
+        [
+            {"id": "G-1", "title": "plaintext path", "severity": "high",
+             "select": "component_pairs_reachable", "via": "protocol != 'tls'",
+             "where": "destination.type == 'store'", "message": "{id}"},
+        ]
+    )
+    otm = sample_otm()
+    inc = IncrementalEvaluator(rules)
+    inc.evaluate(otm)
+    otm.dataflows[3].protocol = "tls"
+    res = inc.update(otm, ChangeSet(modified={"f4"}))
+    assert [f.entityId for f in res.findings] == [f.entityId for f in evaluate(otm, rules).findings]
+    assert [f.entityId for f in res.findings] == ["web->cache"]
+
+
+def test_via_requires_graph_select() -> None:
+    with pytest.raises(ValidationError):
+        load_rules_from_dicts(
+            [{"id": "V", "title": "t", "severity": "low", "select": "dataflows",
+              "via": "protocol == 'tls'", "message": "{id}"}]
+        )
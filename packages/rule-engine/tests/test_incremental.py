@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from rule_engine import evaluate, load_rules_from_dicts
+from rule_engine.incremental import ChangeSet, IncrementalEvaluator
+from otm_model.types import OTM, Component, Dataflow, TrustZone
+
+
+def sample_otm() -> OTM:
+    return OTM(
+        otmVersion="0.1",
+        name="S",
+        trustZones=[TrustZone(id="public", name="Public"), TrustZone(id="private", name="Private")],
+        components=[
+            Component(id="a", name="A", type="process", trustZone="public"),
+            Component(id="b", name="B", type="store", trustZone="public"),
+        ],
+        dataflows=[
+            Dataflow(id="f1", source="a", destination="b", protocol="http"),
+            Dataflow(id="f2", source="b", destination="a", protocol="https"),
+        ],
+    )
+
+
+RULES = load_rules_from_dicts(
+    [
+        {"id": "DF", "title": "plain", "severity": "high", "select": "dataflows",
+         "where": "protocol == 'http'", "message": "{id}"},
+        {"id": "C", "title": "store", "severity": "low", "select": "components",
+         "where": "type == 'store'", "message": "{id}"},
+        {"id": "X", "title": "edge", "severity": "medium", "select": "components",
+         "where": "cross_trust_zone(@)", "message": "{id}"},
+        {"id": "O", "title": "flows", "severity": "info", "select": "otm",
+         "where": "length(dataflows) > `2`", "message": "{name}"},
+    ]
+)
+
+
+def test_update_matches_full_evaluation() -> None:
+    otm = sample_otm()
+    inc = IncrementalEvaluator(RULES)
+    assert inc.evaluate(otm) == evaluate(otm, RULES)
+
+    otm.dataflows[1].protocol = "http"
+    otm.dataflows.append(Dataflow(id="f3", source="a", destination="b", protocol="http"))
+    otm.components = [c for c in otm.components if c.id != "b"]
+    res = inc.update(otm, ChangeSet(added={"f3"}, modified={"f2"}, removed={"b"}))
+    assert res == evaluate(otm, RULES)
+    assert [f.entityId for f in res.findings if f.ruleId == "DF"] == ["f1", "f2", "f3"]
+    assert any(f.ruleId == "O" for f in res.findings)
+
+
+def test_zone_change_reevaluates_neighbours() -> None:
+    otm = sample_otm()
+    inc = IncrementalEvaluator(RULES)
+    assert not [f for f in inc.evaluate(otm).findings if f.ruleId == "X"]
+
+    otm.components[1].trustZone = "private"
+    res = inc.update(otm, ChangeSet(modified={"b"}))
+    assert res == evaluate(otm, RULES)
+    assert [f.entityId for f in res.findings if f.ruleId == "X"] == ["a", "b"]
@@ -37,8 +37,26 @@ def test_merge_deduplicates_and_summarizes() -> None:
     ]
 
     merged = merge_findings(local, external)
-    # first two are duplicates by (entityId, title, severity)
+    # first two share a fingerprint (entityType, entityId, title)
     assert len(merged.findings) == 2
     assert merged.summary.get("high") == 1
     assert merged.summary.get("medium") == 1
+    assert merged.findings[0].sources == ["rule-engine", "external"]
 
+
+def test_merge_streams_and_keeps_highest_severity() -> None:
+    local = [Finding(ruleId="R", title="t", severity="low", entityType="component", entityId="a", message="m")]
+    external = (
+        {"ruleId": f"x{i}", "title": "t", "severity": sev, "entityType": "component", "entityId": "a",
+         "message": "ext"}
+        for i, sev in enumerate(["medium", "critical", "high"])
+    )
+    merged = merge_findings(local, external, external_source="threagile")
+    assert [(f.ruleId, f.severity) for f in merged.findings] == [("x1", "critical")]
+    assert merged.findings[0].sources == ["rule-engine", "threagile"]
+
+
+def test_entity_type_is_part_of_the_fingerprint() -> None:
+    component = Finding(ruleId="R", title="t", severity="low", entityType="component", entityId="x", message="m")
+    dataflow = component.model_copy(update={"entityType": "dataflow"})
+    assert len(merge_findings([component], [dataflow]).findings) == 2
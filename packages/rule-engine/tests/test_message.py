@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from otm_model.types import OTM, Component
+
+from rule_engine import evaluate, load_rules_from_dicts
+from rule_engine.message import MessageTemplate, compile_message
+
+
+def _rule(select: str, message: str) -> dict:
+    return {"id": "M", "title": "t", "severity": "low", "select": select, "message": message}
+
+
+def test_template_fields_are_precompiled() -> None:
+    template = compile_message("{source[name]} -> {destination.id} via {protocol!r:>6}")
+    assert template.fields == {"source", "destination", "protocol"}
+    assert compile_message("{id}") is compile_message("{id}")
+    assert compile_message("flow {id}").render({"id": "f1", "unused": object()}) == "flow f1"
+
+
+@pytest.mark.parametrize(
+    "select,message",
+    [("dataflows", "{name}"), ("components", "{}"), ("components", "{id"), ("paths", "{protocol}")],
+)
+def test_bad_templates_fail_at_load_time(select: str, message: str) -> None:
+    with pytest.raises(ValidationError):
+        load_rules_from_dicts([_rule(select, message)])
+
+
+def test_graph_select_fields_are_known() -> None:
+    rules = load_rules_from_dicts([_rule("paths", "{source[name]} in {hops} hops"), _rule("neighbors", "{reachable}")])
+    assert len(rules) == 2
+
+
+def test_compact_messages_render_when_serialized(monkeypatch) -> None:
+    rendered = []
+    real = MessageTemplate.render
+    monkeypatch.setattr(MessageTemplate, "render", lambda self, obj: rendered.append(obj["id"]) or real(self, obj))
+    otm = OTM(otmVersion="1.0.0", name="L", components=[Component(id="a", name="A", type="process")])
+    result = evaluate(otm, load_rules_from_dicts([_rule("components", "{name} ({id})")]), compact=True)
+    assert rendered == []
+    assert result.to_dict()["findings"][0]["message"] == "A (a)" and rendered == ["a"]
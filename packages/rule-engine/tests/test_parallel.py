@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from rule_engine import evaluate, load_rules_from_dicts
+from rule_engine.parallel import plan_shards
+from otm_model.types import OTM, Component, Dataflow
+
+
+def big_otm(n: int = 40) -> OTM:
+    comps = [Component(id=f"c{i}", name=f"C{i}", type="process", tags=["t"] if i % 3 else []) for i in range(n)]
+    flows = [
+        Dataflow(id=f"f{i}", source=f"c{i}", destination=f"c{(i + 1) % n}", protocol=("http", "https", "tcp")[i % 3])
+        for i in range(n)
+    ]
+    return OTM(otmVersion="0.1", name="big", components=comps, dataflows=flows)
+
+
+def rules(count: int) -> list:
+    return load_rules_from_dicts(
+        {
+            "id": f"R-{i}",
+            "title": f"rule {i}",
+            "severity": "medium",
+            "select": "dataflows" if i % 2 else "components",
+            "where": "protocol != 'https'" if i % 2 else "contains(tags, 't')",
+            "message": "{id}",
+        }
+        for i in range(count)
+    )
+
+
+def test_parallel_matches_serial_order() -> None:
+    otm = big_otm()
+    for rs in (rules(2), rules(7)):  # entity-sharded and rule-sharded
+        serial = evaluate(otm, rs)
+        parallel = evaluate(otm, rs, workers=3)
+        assert parallel.model_dump() == serial.model_dump()
+
+
+def test_plan_shards_splits_entities_for_few_rules() -> None:
+    rs = rules(1)
+    shards = plan_shards({"components": [(0, rs[0])]}, {"components": 10}, 4)
+    assert [(s, e) for _, _, s, e, _ in shards] == [(0, 3), (3, 6), (6, 9), (9, 10)]
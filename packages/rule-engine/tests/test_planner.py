@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import jmespath
+from jmespath import functions
+
+from rule_engine import load_rules_from_dicts
+from rule_engine.planner import PackPlan
+
+
+class CountingFunctions(functions.Functions):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    @functions.signature({"types": ["object"]})
+    def _func_cross_trust_zone(self, obj: Dict[str, Any]) -> bool:
+        self.calls += 1
+        return obj.get("source") != obj.get("destination")
+
+
+def test_shared_subexpression_evaluated_once_per_entity() -> None:
+    rules = load_rules_from_dicts(
+        {"id": f"R-{i}", "title": "t", "severity": "low", "select": "dataflows", "where": where, "message": "{id}"}
+        for i, where in enumerate(
+            [
+                "cross_trust_zone(@) && protocol == 'http'",
+                "cross_trust_zone(@) && contains(tags, 'pci')",
+                "!cross_trust_zone(@)",
+            ]
+        )
+    )
+    fns = CountingFunctions()
+    plan = PackPlan(list(enumerate(rules)), jmespath.Options(custom_functions=fns))
+    assert len(plan.shared) == 3  # one cross_trust_zone(@) node per rule
+
+    entities = [
+        {"id": "f1", "source": "a", "destination": "b", "protocol": "http", "tags": []},
+        {"id": "f2", "source": "a", "destination": "a", "protocol": "http", "tags": ["pci"]},
+    ]
+    hits = []
+    for scope in entities:
+        plan.start(scope)
+        hits.append([plan.matches(parsed, scope) for _, _, parsed in plan.rules])
+
+    assert hits == [[True, False, False], [False, False, True]]
+    assert fns.calls == len(entities)
+    assert plan.interpreter.hits == 4
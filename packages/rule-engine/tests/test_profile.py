@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from rule_engine import evaluate, load_rules_from_dicts
+from otm_model.types import OTM, Component, Dataflow
+
+
+def test_profile_reports_per_rule_counters() -> None:
+    otm = OTM(
+        otmVersion="0.1",
+        name="S",
+        components=[Component(id="a", name="A", type="process"), Component(id="b", name="B", type="store")],
+        dataflows=[
+            Dataflow(id="f1", source="a", destination="b", protocol="http"),
+            Dataflow(id="f2", source="b", destination="a", protocol="https"),
+        ],
+    )
+    rules = load_rules_from_dicts(
+        [
+            {"id": "SIMPLE", "title": "s", "severity": "high", "select": "dataflows",
+             "where": "protocol == 'http'", "message": "{id}"},
+            # abs() on a string raises inside JMESPath and is swallowed as "no match"
+            {"id": "BROKEN", "title": "b", "severity": "low", "select": "components",
+             "where": "abs(name) > `1` || type == name", "message": "{id}"},
+        ]
+    )
+    assert evaluate(otm, rules).profile is None
+
+    for workers in (None, 2):
+        res = evaluate(otm, rules, profile=True, workers=workers)
+        simple, broken = res.profile or []
+        assert (simple.ruleId, simple.candidates, simple.matches, simple.vectorized) == ("SIMPLE", 2, 1, True)
+        assert (broken.ruleId, broken.candidates, broken.matches, broken.errors) == ("BROKEN", 2, 0, 2)
+        assert broken.seconds >= 0.0
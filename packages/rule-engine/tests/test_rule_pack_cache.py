@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+from rule_engine.loader import load_rule_pack, load_rules_from_yaml_dir, save_rule_pack
+
+BUILTIN = Path(__file__).resolve().parents[1] / "rules" / "builtin"
+
+
+def test_yaml_dir_is_cached_until_files_change(tmp_path: Path) -> None:
+    rules_dir = tmp_path / "rules"
+    shutil.copytree(BUILTIN, rules_dir)
+    first = load_rules_from_yaml_dir(rules_dir)
+    assert load_rules_from_yaml_dir(rules_dir)[0] is first[0]
+
+    (rules_dir / "extra.yaml").write_text(
+        "id: X-1\ntitle: x\nseverity: low\nselect: components\nmessage: '{id}'\n", encoding="utf-8"
+    )
+    assert [r.id for r in load_rules_from_yaml_dir(rules_dir)] == ["DF-TLS-001", "X-1"]
+
+
+def test_binary_pack_roundtrip_and_staleness(tmp_path: Path) -> None:
+    rules_dir = tmp_path / "rules"
+    shutil.copytree(BUILTIN, rules_dir)
+    pack = tmp_path / "builtin.pack"
+    save_rule_pack(rules_dir, pack)
+
+    loaded = load_rule_pack(pack, rules_dir)
+    assert loaded == load_rules_from_yaml_dir(rules_dir)
+
+    (rules_dir / "DF-TLS-001.yaml").write_text(
+        (rules_dir / "DF-TLS-001.yaml").read_text(encoding="utf-8").replace("high", "critical"), encoding="utf-8"
+    )
+    assert load_rule_pack(pack, rules_dir) is None
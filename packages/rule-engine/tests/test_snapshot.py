@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from rule_engine import evaluate, load_rules_from_dicts
+from rule_engine.snapshot import EntitySnapshot
+from otm_model.types import OTM, Component, Dataflow
+
+
+def sample_otm() -> OTM:
+    return OTM(
+        otmVersion="0.1",
+        name="S",
+        components=[Component(id="a", name="A", type="process"), Component(id="b", name="B", type="store")],
+        dataflows=[
+            Dataflow(id="f1", source="a", destination="b", protocol="http"),
+            Dataflow(id="f2", source="b", destination="a", protocol="tcp"),
+        ],
+    )
+
+
+def test_snapshot_materializes_each_collection_once() -> None:
+    snap = EntitySnapshot(sample_otm())
+    assert snap.entities("dataflows") is snap.entities("dataflows")
+    assert [d["id"] for d in snap.entities("dataflows")] == ["f1", "f2"]
+
+
+def test_findings_follow_rule_order() -> None:
+    rules = load_rules_from_dicts(
+        [
+            {"id": "R-TCP", "title": "tcp", "severity": "low", "select": "dataflows",
+             "where": "protocol == 'tcp'", "message": "{id}"},
+            {"id": "R-ANY", "title": "any", "severity": "low", "select": "dataflows", "message": "{id}"},
+            {"id": "R-C", "title": "c", "severity": "low", "select": "components", "message": "{id}"},
+        ]
+    )
+    res = evaluate(sample_otm(), rules)
+    assert [(f.ruleId, f.entityId) for f in res.findings] == [
+        ("R-TCP", "f2"),
+        ("R-ANY", "f1"),
+        ("R-ANY", "f2"),
+        ("R-C", "a"),
+        ("R-C", "b"),
+    ]
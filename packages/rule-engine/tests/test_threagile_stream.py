@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import io
+import json
+
+from rule_engine.integrations.threagile import build_asset_index, iter_threagile_risks
+from rule_engine.merge import merge_findings
+from rule_engine.model import EvaluationResult, Finding
+
+RISKS = [
+    {"category": "unencrypted-communication", "severity": "elevated", "title": "Unencrypted link",
+     "synthetic_id": "unencrypted-communication@web>api", "most_relevant_technical_asset": "web-server",
+     "data_breach_technical_assets": ["web-server", "api"]},
+    {"category": "missing-waf", "severity": "medium", "title": "Missing WAF", "synthetic_id": "missing-waf@api",
+     "most_relevant_technical_asset": "api-id", "risk_status": "unchecked"},
+]
+
+
+def test_stream_parses_bare_and_wrapped_reports_across_chunks() -> None:
+    index = build_asset_index({"technical_assets": {"api": {"id": "api-id"}, "web-server": {"id": "web-server"}}})
+    for doc in (RISKS, {"title": "t", "risks": RISKS, "stats": {"n": 2.5}}):
+        found = list(iter_threagile_risks(io.StringIO(json.dumps(doc, indent=1)), index, chunk_size=7))
+        assert [(f.ruleId, f.severity, f.entityId) for f in found] == [
+            ("unencrypted-communication", "high", "web-server"),
+            ("missing-waf", "medium", "api"),
+        ]
+        assert "data_breach_technical_assets" not in found[0].evidence
+
+
+def test_top_level_numbers_survive_every_chunk_boundary() -> None:
+    text = json.dumps({"score": 12.75, "weight": -3e5, "count": 7, "risks": RISKS, "ratio": 0.5})
+    for chunk_size in range(1, len(text) + 1):
+        found = list(iter_threagile_risks(io.StringIO(text), chunk_size=chunk_size))
+        assert [f.ruleId for f in found] == ["unencrypted-communication", "missing-waf"], chunk_size
+
+
+def test_stream_plugs_into_merge(tmp_path) -> None:
+    path = tmp_path / "risks.json"
+    path.write_text(json.dumps(RISKS), encoding="utf-8")
+    local = EvaluationResult(
+        findings=[Finding(ruleId="R", title="Missing WAF", severity="low", entityType="component",
+                          entityId="api-id", message="m")]
+    )
+    merged = merge_findings(local, iter_threagile_risks(path), external_source="threagile")
+    assert [(f.ruleId, f.sources) for f in merged.findings] == [
+        ("missing-waf", ["rule-engine", "threagile"]),
+        ("unencrypted-communication", ["threagile"]),
+    ]
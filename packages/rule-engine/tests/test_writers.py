@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import io
+import json
+
+from rule_engine import evaluate, load_rules_from_dicts
+from rule_engine.writers import write_ndjson, write_sarif
+from otm_model.types import OTM, Component, Dataflow
+
+RULES = [
+    {"id": "DF", "title": "plain", "severity": "high", "select": "dataflows",
+     "where": "protocol == 'http'", "message": "flow {id}", "remediation": "use tls"},
+    {"id": "ST", "title": "store", "severity": "low", "select": "components",
+     "where": "type == 'store'", "message": "{name}"},
+]
+
+
+def sample_result(compact: bool):
+    otm = OTM(
+        otmVersion="0.1",
+        name="W",
+        components=[Component(id="a", name="A", type="process"), Component(id="b", name="B", type="store")],
+        dataflows=[Dataflow(id="f1", source="a", destination="b", protocol="http")],
+    )
+    return evaluate(otm, load_rules_from_dicts(RULES), compact=compact)
+
+
+def test_ndjson_matches_model_dump() -> None:
+    out = io.StringIO()
+    summary = write_ndjson(sample_result(compact=True).findings, out)
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert lines[:-1] == [f.model_dump() for f in sample_result(compact=False).findings]
+    assert lines[-1] == {"summary": summary} == {"summary": {"high": 1, "low": 1}}
+
+
+def test_sarif_log_is_valid_json() -> None:
+    for compact in (True, False):
+        out = io.StringIO()
+        write_sarif(sample_result(compact).findings, out)
+        run = json.loads(out.getvalue())["runs"][0]
+        assert [(r["ruleId"], r["level"], r["message"]["text"]) for r in run["results"]] == [
+            ("DF", "error", "flow f1"),
+            ("ST", "note", "B"),
+        ]
+        assert [r["id"] for r in run["tool"]["driver"]["rules"]] == ["DF", "ST"]
+        assert run["properties"]["summary"] == {"high": 1, "low": 1}
+
+
+def test_partial_runs_are_marked_in_both_formats() -> None:
+    findings = sample_result(compact=True).findings
+    out = io.StringIO()
+    write_ndjson(findings, out, pending_rules=["R2"])
+    last = json.loads(out.getvalue().splitlines()[-1])
+    assert last == {"summary": {"high": 1, "low": 1}, "partial": True, "pendingRules": ["R2"]}
+
+    out = io.StringIO()
+    write_sarif(findings, out, pending_rules=["R2"])
+    run = json.loads(out.getvalue())["runs"][0]
+    assert run["invocations"][0]["executionSuccessful"] is False
+    assert run["properties"]["partial"] is True and run["properties"]["pendingRules"] == ["R2"]
@@ -22,7 +22,10 @@ def main() -> None:
     for key, rec in data.items():
         path = ROOT / rec["path"]
         if not path.exists():
-            raise SystemExit(f"Missing schema file: {path}")
+            # not vendored yet; the schema registry reports it as unavailable
+            print(f"Skipping missing schema file: {path}")
+            rec["sha256"] = ""
+            continue
         rec["sha256"] = sha256_of(path)
     INDEX.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
     print("Updated schema-index.json with sha256 digests")
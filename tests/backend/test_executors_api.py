@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 import sys
 
@@ -11,6 +12,7 @@ SERVER_SRC = ROOT / "apps" / "langflow-server" / "src"
 sys.path.insert(0, str(SERVER_SRC))
 
 from threatflow_server.app import app
+from otm_model.trusted import is_trusted
 
 
 def test_dataflow_and_trustzone_ops() -> None:
@@ -51,4 +53,119 @@ def test_dataflow_and_trustzone_ops() -> None:
     otm = resp.json()
     comp_a = next(c for c in otm["components"] if c["id"] == "a")
     assert comp_a["trustZone"] == "tz2"
+    assert is_trusted(otm)
 
+    resp = client.post("/otm/trustzone", json={"otm": otm, "op": {"action": "assign", "componentId": "a", "trustZoneId": 5}})
+    assert resp.status_code == 400
+
+
+
+def test_rule_engine_streams_ndjson() -> None:
+    client = TestClient(app)
+    otm = {
+        "otmVersion": "0.1",
+        "name": "S",
+        "components": [{"id": "a", "name": "A", "type": "process"}, {"id": "b", "name": "B", "type": "store"}],
+        "dataflows": [{"id": "f1", "source": "a", "destination": "b", "protocol": "http"}],
+    }
+    resp = client.post("/components/RuleEngineEvaluate/execute", json={"otm": otm, "op": {"stream": "ndjson"}})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [line["entityId"] for line in lines[:-1]] == ["f1"]
+    assert lines[-1] == {"summary": {"high": 1}}
+
+    # an exhausted budget must not look like a clean run
+    resp = client.post(
+        "/components/RuleEngineEvaluate/execute", json={"otm": otm, "op": {"stream": "ndjson", "deadline_ms": 0}}
+    )
+    last = json.loads(resp.text.splitlines()[-1])
+    assert last["partial"] is True and last["pendingRules"]
+
+
+def test_binary_otm_content_negotiation() -> None:
+    from otm_model import codec
+    from otm_model.types import OTM
+
+    client = TestClient(app)
+    otm = OTM.model_validate({"otmVersion": "0.1", "name": "B", "components": [{"id": "a", "name": "A", "type": "process"}]})
+    data, _ = codec.encode_otm(otm)
+    op = {"action": "add", "trustZone": {"id": "tz1", "name": "TZ1"}}
+    resp = client.post(
+        "/otm/trustzone",
+        params={"op": json.dumps(op)},
+        content=data,
+        headers={"Content-Type": codec.MEDIA_TYPE, "Accept": codec.MEDIA_TYPE},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == codec.MEDIA_TYPE
+    assert resp.headers["etag"] == f'"{codec.read_digest(resp.content)}"'
+    assert [z.id for z in codec.decode_otm(resp.content).trustZones] == ["tz1"]
+
+    # JSON in, binary out; and corrupt binary input is rejected
+    resp = client.post("/otm/trustzone", json={"otm": otm.model_dump(), "op": op}, headers={"Accept": codec.MEDIA_TYPE})
+    assert codec.decode_otm(resp.content).trustZones[0].id == "tz1"
+    resp = client.post("/otm/trustzone", content=data[:-3], headers={"Content-Type": codec.MEDIA_TYPE})
+    assert resp.status_code == 400
+
+
+def test_binary_requests_validate_like_json_and_keep_openapi_bodies() -> None:
+    from otm_model import codec
+    from otm_model.types import OTM
+
+    client = TestClient(app)
+    doc = {"otmVersion": "1.0.0", "name": "V", "components": [{"id": "a", "name": "A", "type": "process"}]}
+    data, _ = codec.encode_otm(OTM.model_validate(doc))
+    as_json = client.post("/components/OTMValidate/execute", json={"otm": doc, "op": {}}).json()
+    as_binary = client.post(
+        "/components/OTMValidate/execute", content=data, headers={"Content-Type": codec.MEDIA_TYPE}
+    ).json()
+    assert as_binary == as_json
+
+    paths = client.get("/openapi.json").json()["paths"]
+    for path in ("/otm/dataflow", "/otm/trustzone", "/components/{comp_id}/execute"):
+        content = paths[path]["post"]["requestBody"]["content"]
+        assert set(content) == {"application/json", codec.MEDIA_TYPE}
+
+
+def test_rule_engine_workers_are_validated_and_clamped(monkeypatch) -> None:
+    import os
+
+    from threatflow_server import executors
+
+    client = TestClient(app)
+    otm = {"otmVersion": "0.1", "name": "W"}
+    resp = client.post("/components/RuleEngineEvaluate/execute", json={"otm": otm, "op": {"workers": "many"}})
+    assert resp.status_code == 400
+
+    seen = {}
+
+    def fake_evaluate(otm, rules, **kw):
+        seen["workers"] = kw["workers"]
+        return real(otm, rules, **{**kw, "workers": None})
+
+    real = executors.re_evaluate
+    monkeypatch.setattr(executors, "re_evaluate", fake_evaluate)
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    resp = client.post("/components/RuleEngineEvaluate/execute", json={"otm": otm, "op": {"workers": 500}})
+    assert resp.status_code == 200 and seen["workers"] == 2
+
+
+def test_rule_engine_deadline_is_validated() -> None:
+    client = TestClient(app)
+    otm = {"otmVersion": "0.1", "name": "D"}
+    for bad in ("x", -1, True):
+        resp = client.post("/components/RuleEngineEvaluate/execute", json={"otm": otm, "op": {"deadline_ms": bad}})
+        assert resp.status_code == 400 and "deadline_ms" in resp.json()["detail"]
+    resp = client.post("/components/RuleEngineEvaluate/execute", json={"otm": otm, "op": {"deadline_ms": 2.5}})
+    assert resp.status_code == 200
+
+
+def test_rule_engine_max_findings_is_validated() -> None:
+    client = TestClient(app)
+    otm = {"otmVersion": "0.1", "name": "M"}
+    for bad in ("x", -1, 1.5, False):
+        resp = client.post("/components/RuleEngineEvaluate/execute", json={"otm": otm, "op": {"max_findings": bad}})
+        assert resp.status_code == 400 and "max_findings" in resp.json()["detail"]
+    resp = client.post("/components/RuleEngineEvaluate/execute", json={"otm": otm, "op": {"max_findings": 0}})
+    assert resp.status_code == 200
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from threatflow_bench import generate_otm, run_benchmarks
+from threatflow_bench.__main__ import compare
+
+
+def test_generator_is_seeded_and_sized() -> None:
+    a = generate_otm(components=50, trust_zones=3, dataflow_density=2.0, threats=10, seed=7)
+    assert a == generate_otm(components=50, trust_zones=3, dataflow_density=2.0, threats=10, seed=7)
+    assert a != generate_otm(components=50, trust_zones=3, dataflow_density=2.0, threats=10, seed=8)
+    assert len(a.components) == 50
+    assert len(a.dataflows) == 100
+    assert {c.trustZone for c in a.components} <= {"tz0", "tz1", "tz2"}
+    assert all(d.source != d.destination for d in a.dataflows)
+
+
+def test_suites_run_and_compare_to_baseline() -> None:
+    results = run_benchmarks(size=20, repeat=1, names=["rule_engine"])
+    assert set(results) == {"rule_engine.evaluate", "rule_engine.evaluate_compact", "rule_engine.merge_findings"}
+    assert compare({"x": 2.0, "y": 1.0}, {"x": 1.0, "y": 1.0}, tolerance=0.25) == ["x"]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from otm_model import codec
+from otm_model.types import OTM
+
+
+def _doc() -> dict:
+    return {
+        "otmVersion": "1.0.0",
+        "name": "Codec",
+        "trustZones": [{"id": "z1", "name": "Z1"}],
+        "components": [
+            {"id": "a", "name": "A", "type": "process", "trustZone": "z1", "tags": ["web", "é"]},
+            {"id": "b", "name": "B", "type": "process"},
+        ],
+        "dataflows": [{"id": "f1", "source": "a", "destination": "b", "protocol": "https"}],
+        "threats": [{"id": "t1", "name": "T1", "appliesTo": ["a"]}],
+        "extensions": {"x": {"weight": 1.5, "count": -3, "flags": [True, None]}},
+    }
+
+
+def test_roundtrip_and_canonical_hash() -> None:
+    otm = OTM.model_validate(_doc())
+    data, digest = codec.encode_otm(otm)
+    assert codec.decode_otm(data) == otm
+    assert codec.read_digest(data) == digest
+    # same content read with another key order hashes the same
+    shuffled = json.loads(json.dumps(_doc(), sort_keys=True))
+    assert codec.content_hash(OTM.model_validate(shuffled)) == digest
+    assert codec.content_hash(otm.model_copy(update={"name": "Other"})) != digest
+
+
+def test_corrupt_data_is_rejected() -> None:
+    data = bytearray(codec.encode_otm(OTM.model_validate(_doc()))[0])
+    data[-1] ^= 1
+    with pytest.raises(codec.CodecError, match="digest"):
+        codec.decode_otm(bytes(data))
+    with pytest.raises(codec.CodecError):
+        codec.decode_otm(b"{}")
+
+
+def test_snapshots_load_through_mmap(tmp_path) -> None:
+    otm = OTM.model_validate(_doc())
+    path = tmp_path / "model.otmb"
+    digest = codec.save_snapshot(path, otm)
+    snapshot = codec.load_snapshot(path)
+    assert snapshot.components[0].tags == ["web", "é"]
+    assert snapshot.to_otm() == otm
+    assert codec.read_digest(path.read_bytes()) == digest
+
+
+def test_slices_encode_like_the_equal_otm() -> None:
+    from otm_model.columnar import ColumnarOTM
+
+    otm = OTM.model_validate(_doc())
+    col = ColumnarOTM.from_otm(otm)
+    tail = ColumnarOTM(col.header, col.strings, col.components[1:], col.dataflows[0:0])
+    equal = otm.model_copy(update={"components": otm.components[1:], "dataflows": []})
+    assert codec.encode_otm(tail) == codec.encode_otm(equal)
+    assert codec.encode_otm(col) == codec.encode_otm(otm)
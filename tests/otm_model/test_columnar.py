@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+
+from otm_model.columnar import ColumnarOTM
+from otm_model.types import OTM, Component, Dataflow, TrustZone
+
+
+def _otm() -> OTM:
+    return OTM(
+        otmVersion="1.0.0",
+        name="C",
+        trustZones=[TrustZone(id="z1", name="Z1")],
+        components=[
+            Component(id="a", name="A", type="process", trustZone="z1", tags=["internet", "web"]),
+            Component(id="b", name="B", type="process"),
+            Component(id="c", name="C", type="store", tags=["pii"]),
+        ],
+        dataflows=[
+            Dataflow(id="f1", source="a", destination="b", protocol="https"),
+            Dataflow(id="f2", source="b", destination="c"),
+        ],
+    )
+
+
+def test_roundtrip_and_shared_string_table() -> None:
+    otm = _otm()
+    col = ColumnarOTM.from_otm(otm)
+    assert col.to_otm() == otm
+    assert ColumnarOTM.from_dict(otm.model_dump()).to_otm() == otm
+    # "process" is stored once; dataflow endpoints share component id codes
+    assert col.strings.values.count("process") == 1
+    assert col.dataflows.sources[0] == col.components.ids[0]
+    assert col.component_positions()[col.dataflows.destinations[1]] == 2
+
+
+def test_rows_and_zero_copy_slices() -> None:
+    col = ColumnarOTM.from_otm(_otm())
+    rows = list(col.components)
+    assert [r.id for r in rows] == ["a", "b", "c"]
+    assert rows[0].tags == ["internet", "web"] and rows[1].trustZone is None
+    tail = col.components[1:]
+    assert tail.id_list() == ["b", "c"]
+    assert tail[-1].tags == ["pii"] and tail[0].tags == []
+    assert tail.ids.obj is col.components.ids.obj
+    assert len(col.components[2:1]) == 0
+    assert col.dataflows[1].protocol is None
+    with pytest.raises(ValueError):
+        col.components[::2]
+
+
+def test_from_dict_reports_missing_row_fields() -> None:
+    with pytest.raises(ValueError, match=r"dataflows\[0\]: missing 'source'"):
+        ColumnarOTM.from_dict({"otmVersion": "1.0.0", "name": "x", "dataflows": [{"id": "f", "destination": "a"}]})
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from otm_model.index import index_of
+from otm_model.types import OTM, Component, Dataflow, TrustZone
+
+
+def _otm() -> OTM:
+    return OTM(
+        otmVersion="1.0.0",
+        name="I",
+        trustZones=[TrustZone(id="z1", name="Z1")],
+        components=[
+            Component(id="a", name="A", type="process", trustZone="z1"),
+            Component(id="b", name="B", type="process", trustZone="z1"),
+            Component(id="c", name="C", type="datastore"),
+        ],
+        dataflows=[
+            Dataflow(id="f1", source="a", destination="b"),
+            Dataflow(id="f2", source="a", destination="c"),
+            Dataflow(id="f3", source="c", destination="missing"),
+        ],
+    )
+
+
+def test_lookups() -> None:
+    idx = index_of(_otm())
+    assert idx.entity("z1").name == "Z1"
+    assert idx.entity("f2").destination == "c"
+    assert idx.component_zone == {"a": "z1", "b": "z1", "c": None}
+    assert list(idx.dataflows) == ["f1", "f2", "f3"]
+
+
+def test_index_is_reused_until_the_model_changes() -> None:
+    otm = _otm()
+    first = index_of(otm)
+    assert index_of(otm) is first
+    otm.components[2].trustZone = "z1"
+    second = index_of(otm)
+    assert second is not first and second.component_zone["c"] == "z1"
+    otm.dataflows.append(Dataflow(id="f4", source="b", destination="a"))
+    assert "f4" in index_of(otm).dataflows
+    # other instances with equal content get their own index
+    assert index_of(_otm()) is not index_of(otm)
+
+
+def test_edits_to_other_models_keep_the_index() -> None:
+    otm, other = _otm(), _otm()
+    first = index_of(otm)
+    other.components[0].trustZone = None
+    other.name = "renamed"
+    assert index_of(otm) is first
+    # fields the index does not read do not invalidate it either
+    otm.components[0].name = "renamed"
+    assert index_of(otm) is first
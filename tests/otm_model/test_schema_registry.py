@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from jsonschema import ValidationError
+
+from otm_model.schemas import SchemaError, SchemaRegistry, schema_registry, validate
+
+ROOT = Path(__file__).resolve().parents[2]
+DOC = {
+    "otmVersion": "1.0.0",
+    "name": "Sample App",
+    "trustZones": [{"id": "tz1", "name": "DMZ"}],
+    "components": [{"id": "c1", "name": "Web", "type": "process", "trustZone": "tz1"}],
+}
+
+
+def test_registry_validates_and_collects_errors() -> None:
+    assert validate("otm", DOC) == []
+    bad = {**DOC, "otmVersion": "0.1", "components": [{"id": "c1"}]}
+    with pytest.raises(ValidationError):
+        validate("otm", bad)
+    errors = validate("otm", bad, collect=True)
+    assert len(errors) >= 2
+    assert {e["path"] for e in errors} >= {"/otmVersion", "/components/0"}
+    assert schema_registry() is schema_registry()
+
+
+def test_missing_and_tampered_schemas_are_unavailable(tmp_path: Path) -> None:
+    schema = tmp_path / "schemas" / "otm.json"
+    schema.parent.mkdir()
+    schema.write_text(json.dumps({"type": "object"}), encoding="utf-8")
+    index = tmp_path / "schemas" / "index.json"
+    index.write_text(
+        json.dumps(
+            {
+                "ok": {"path": "schemas/otm.json", "sha256": ""},
+                "tampered": {"path": "schemas/otm.json", "sha256": "0" * 64},
+                "missing": {"path": "schemas/nope.json", "sha256": ""},
+            }
+        ),
+        encoding="utf-8",
+    )
+    registry = SchemaRegistry(index, root=tmp_path)
+    assert registry.available() == {"ok": True, "tampered": False, "missing": False}
+    assert registry.validate("ok", {}) == []
+    for kind in ("tampered", "missing", "unknown"):
+        with pytest.raises(SchemaError):
+            registry.validate(kind, {})
+
+
+def test_missing_index_makes_schemas_unavailable(tmp_path: Path) -> None:
+    registry = SchemaRegistry(tmp_path / "schema-index.json", root=tmp_path)
+    assert registry.available() == {}
+    with pytest.raises(SchemaError, match="schema index"):
+        registry.validate("otm", DOC)
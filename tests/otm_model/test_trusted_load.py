@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from otm_model import trusted
+from otm_model.trusted import clear_trusted, dump_otm, is_trusted, load_otm
+from otm_model.types import OTM, Component
+
+
+def test_dumped_documents_load_without_revalidation() -> None:
+    clear_trusted()
+    otm = OTM(otmVersion="1.0.0", name="T", components=[Component(id="a", name="A", type="process")])
+    doc = dump_otm(otm)
+    assert is_trusted(doc)
+    assert load_otm(doc) is otm
+    # a changed document is validated again
+    edited = {**doc, "name": "T2"}
+    assert not is_trusted(edited)
+    assert load_otm(edited).name == "T2"
+    assert load_otm(edited) is load_otm(edited)
+
+
+def test_mutable_loads_are_fresh_and_not_cached() -> None:
+    clear_trusted()
+    doc = {"otmVersion": "1.0.0", "name": "M"}
+    first = load_otm(doc, mutable=True)
+    assert load_otm(doc, mutable=True) is not first
+    assert not is_trusted(doc)
+
+
+def test_mutable_loads_skip_the_digest(monkeypatch) -> None:
+    monkeypatch.setattr(trusted, "document_digest", lambda doc: pytest.fail("digest computed"))
+    assert load_otm({"otmVersion": "1.0.0", "name": "M"}, mutable=True).name == "M"
+
+
+def test_documents_stay_trusted_across_a_json_round_trip() -> None:
+    clear_trusted()
+    otm = OTM(otmVersion="1.0.0", name="W", components=[Component(id="a", name="A", type="process")])
+    wire = json.loads(json.dumps(dump_otm(otm)))
+    reordered = json.loads(json.dumps(wire, sort_keys=True))
+    assert is_trusted(wire) and is_trusted(reordered)
+    assert load_otm(wire) is otm